@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""Load generator open-loop (arrival rate konstan) untuk keempat aplikasi demo.
+
+Request dijadwalkan pada laju tetap (--rps per aplikasi) tanpa menunggu
+response sebelumnya. Latency dihitung dari waktu request *seharusnya*
+dikirim, bukan saat koneksi akhirnya tersedia, jadi antrian di sisi client
+ikut terhitung (koreksi coordinated omission). Request yang timeout (saat
+menunggu koneksi dari pool maupun menunggu response) tetap masuk histogram
+latency dengan waktu sampai timeout, dan dihitung sebagai error bersama
+response non-2xx. Hasil percentile disimpan ke JSON.
+
+Jalankan dari root project:
+    python benchmarks/load_generator.py --rps 20 --duration 30
+    python benchmarks/load_generator.py --apps ecommerce-app --rps 10,20,50,100 --output saturation.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from urllib.parse import urlsplit
+
+# Endpoint dan bobot default per aplikasi (port host dari docker-compose.yml)
+DEFAULT_TARGETS = {
+    'sample-app': ('http://localhost:8000', {'/': 3, '/health': 1, '/simulate-load': 1}),
+    'ecommerce-app': ('http://localhost:8001', {'/': 3, '/api/stats': 2, '/health': 1, '/simulate-sales': 1}),
+    'weather-app': ('http://localhost:8002', {'/': 3, '/api/stats': 2, '/health': 1, '/update-weather': 1}),
+    'social-app': ('http://localhost:8003', {'/': 3, '/api/stats': 2, '/health': 1, '/generate-content': 1}),
+}
+
+PERCENTILES = (50.0, 75.0, 90.0, 95.0, 99.0, 99.9, 99.99)
+
+
+class LatencyHistogram:
+    """Histogram ala HdrHistogram: presisi relatif tetap, memori tidak tumbuh per sample.
+
+    Nilai disimpan dalam mikrodetik dan dibulatkan ke `digits` angka
+    signifikan, jadi p99 dari jutaan request tetap akurat sampai ~0.1%.
+    """
+
+    def __init__(self, digits=3):
+        self.digits = digits
+        self.counts = {}
+        self.total = 0
+        self.sum = 0
+        self.max = 0
+
+    def bucket(self, value):
+        width = 10 ** max(len(str(value)) - self.digits, 0)
+        return value - value % width, width
+
+    def record(self, seconds):
+        value = max(int(seconds * 1e6), 0)
+        key, _ = self.bucket(value)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.total += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def value_at(self, percentile):
+        target = max(percentile / 100.0 * self.total, 1)
+        seen = 0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            if seen >= target:
+                _, width = self.bucket(key)
+                # Seperti HdrHistogram: laporkan nilai tertinggi yang setara di bucket
+                return min(key + width - 1, self.max)
+        return self.max
+
+    def summary(self):
+        if not self.total:
+            return {'count': 0}
+        result = {'count': self.total, 'mean_ms': round(self.sum / self.total / 1000, 3)}
+        for percentile in PERCENTILES:
+            result[f'p{percentile:g}_ms'] = round(self.value_at(percentile) / 1000, 3)
+        result['max_ms'] = round(self.max / 1000, 3)
+        return result
+
+
+class Connection:
+    """Koneksi HTTP/1.1 keep-alive minimal di atas asyncio streams"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, path, client_id):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(f'GET {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n'
+                          f'Accept-Encoding: identity\r\nX-Client-Id: {client_id}\r\n\r\n'.encode('latin-1'))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError('connection closed by server')
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if 'content-length' in headers:
+            await self.reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        else:
+            await self.reader.read()
+            self.close()
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class AppLoad:
+    """Hasil pengukuran satu aplikasi pada satu laju target"""
+
+    def __init__(self, name):
+        self.name = name
+        self.sent = 0
+        self.completed = 0
+        self.errors = 0
+        self.statuses = {}
+        self.latency = LatencyHistogram()
+        self.service_time = LatencyHistogram()
+        self.endpoints = {}
+
+    def record(self, path, status, latency, service_time=None):
+        """Catat satu hasil; `status` bisa kode HTTP atau 'timeout' / 'error'.
+
+        Kegagalan tetap masuk histogram latency supaya tail tidak terlihat
+        lebih baik dari kenyataan saat server mulai kewalahan.
+        """
+        if isinstance(status, int) and 200 <= status < 300:
+            self.completed += 1
+        else:
+            self.errors += 1
+        self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+        self.latency.record(latency)
+        if service_time is not None:
+            self.service_time.record(service_time)
+        self.endpoints.setdefault(path, LatencyHistogram()).record(latency)
+
+    def summary(self, elapsed):
+        return {
+            'sent': self.sent,
+            'completed': self.completed,
+            'errors': self.errors,
+            'achieved_rps': round(self.completed / elapsed, 2) if elapsed else 0.0,
+            'status': self.statuses,
+            'latency': self.latency.summary(),
+            'service_time': self.service_time.summary(),
+            'endpoints': {path: hist.summary() for path, hist in sorted(self.endpoints.items())},
+        }
+
+
+async def send(result, pool, path, client_id, intended, timeout):
+    try:
+        connection = await asyncio.wait_for(pool.get(), timeout)
+    except asyncio.TimeoutError:
+        # Pool habis: request tidak pernah terkirim, tapi client sudah menunggu selama ini
+        result.record(path, 'timeout', time.perf_counter() - intended)
+        return
+    started = time.perf_counter()
+    try:
+        status = await asyncio.wait_for(connection.request(path, client_id), timeout)
+    except asyncio.TimeoutError:
+        connection.close()
+        result.record(path, 'timeout', time.perf_counter() - intended)
+    except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+        connection.close()
+        result.record(path, 'error', time.perf_counter() - intended)
+    else:
+        finished = time.perf_counter()
+        result.record(path, status, finished - intended, finished - started)
+    finally:
+        pool.put_nowait(connection)
+
+
+async def drive_app(name, base_url, weights, rps, duration, concurrency, timeout, seed, users):
+    """Kirim request ke satu aplikasi dengan jadwal kedatangan tetap selama `duration` detik"""
+    url = urlsplit(base_url)
+    pool = asyncio.Queue()
+    for _ in range(concurrency):
+        pool.put_nowait(Connection(url.hostname, url.port or 80))
+
+    rng = random.Random(f'{seed}:{name}')
+    paths, path_weights = list(weights), list(weights.values())
+    result = AppLoad(name)
+    tasks = []
+    start = time.perf_counter()
+    interval = 1.0 / rps
+    while True:
+        intended = start + result.sent * interval
+        if intended - start >= duration:
+            break
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        path = rng.choices(paths, path_weights)[0]
+        # Setiap request mewakili salah satu dari `users` pengunjung simulasi
+        client_id = f'load-{rng.randrange(users)}'
+        tasks.append(asyncio.ensure_future(send(result, pool, path, client_id, intended, timeout)))
+        result.sent += 1
+
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    while not pool.empty():
+        pool.get_nowait().close()
+    return name, result.summary(elapsed)
+
+
+async def run_step(targets, rps, args):
+    runs = [drive_app(name, base_url, weights, rps, args.duration, args.concurrency, args.timeout, args.seed,
+                      args.users)
+            for name, (base_url, weights) in targets.items()]
+    return {'target_rps': rps, 'apps': dict(await asyncio.gather(*runs))}
+
+
+def parse_weights(specs):
+    """Format --weights: nama-app=/path:bobot,/path:bobot"""
+    overrides = {}
+    for spec in specs:
+        name, _, pairs = spec.partition('=')
+        weights = {}
+        for pair in pairs.split(','):
+            path, _, weight = pair.rpartition(':')
+            weights[path] = float(weight)
+        overrides[name] = weights
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--apps', default=','.join(DEFAULT_TARGETS),
+                        help='aplikasi yang diuji, dipisah koma')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--rps', default='10',
+                        help='laju target per aplikasi; beberapa nilai (10,20,50) dijalankan berurutan')
+    parser.add_argument('--duration', type=float, default=30.0, help='durasi setiap langkah (detik)')
+    parser.add_argument('--concurrency', type=int, default=50, help='koneksi maksimum per aplikasi')
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--weights', action='append', default=[],
+                        help='bobot endpoint, contoh: ecommerce-app=/:3,/simulate-sales:1')
+    parser.add_argument('--users', type=int, default=1000,
+                        help='jumlah pengunjung simulasi (header X-Client-Id)')
+    parser.add_argument('--seed', default='load')
+    parser.add_argument('--output', default='load-report.json')
+    args = parser.parse_args()
+
+    overrides = parse_weights(args.weights)
+    targets = {}
+    for name in args.apps.split(','):
+        base_url, weights = DEFAULT_TARGETS[name]
+        port = urlsplit(base_url).port
+        targets[name] = (f'http://{args.host}:{port}', overrides.get(name, weights))
+
+    report = {
+        'started_at': time.time(),
+        'duration': args.duration,
+        'concurrency': args.concurrency,
+        'users': args.users,
+        'weights': {name: weights for name, (_, weights) in targets.items()},
+        'steps': [],
+    }
+
+    print(f"{'rps':>6}  {'app':<16}{'achieved':>10}{'errors':>8}{'p50 ms':>10}{'p99 ms':>10}{'p99.9 ms':>10}")
+    for rps in [float(value) for value in args.rps.split(',')]:
+        step = asyncio.run(run_step(targets, rps, args))
+        report['steps'].append(step)
+        for name, result in step['apps'].items():
+            latency = result['latency']
+            print(f"{rps:>6g}  {name:<16}{result['achieved_rps']:>10}{result['errors']:>8}"
+                  f"{latency.get('p50_ms', '-'):>10}{latency.get('p99_ms', '-'):>10}{latency.get('p99.9_ms', '-'):>10}")
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Report disimpan ke {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Benchmark render halaman dashboard: render_template_string vs template terkompilasi.
+
+Jalankan dari root project:
+    python benchmarks/render_benchmark.py --iterations 2000
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+from flask import render_template_string
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DASHBOARD_APPS = ['ecommerce-app', 'weather-app', 'social-app']
+
+
+class RecordingTemplate:
+    """Membungkus HOME_TEMPLATE untuk merekam context dari satu request asli"""
+
+    def __init__(self, template):
+        self.template = template
+        self.context = None
+
+    def render(self, **context):
+        self.context = context
+        return self.template.render(**context)
+
+
+def load_app(folder):
+    path = os.path.join(ROOT, folder, 'app.py')
+    spec = importlib.util.spec_from_file_location(folder.replace('-', '_'), path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def capture_context(module):
+    recorder = RecordingTemplate(module.HOME_TEMPLATE)
+    module.HOME_TEMPLATE = recorder
+    try:
+        module.app.test_client().get('/')
+    finally:
+        module.HOME_TEMPLATE = recorder.template
+    return recorder.context
+
+
+def measure(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'app':<16}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}")
+    for folder in DASHBOARD_APPS:
+        module = load_app(folder)
+        context = capture_context(module)
+
+        with module.app.app_context():
+            before = measure(lambda: render_template_string(module.HTML_TEMPLATE, **context), args.iterations)
+            after = measure(lambda: module.HOME_TEMPLATE.render(**context), args.iterations)
+
+        print(f"{folder:<16}{before * 1e6:>14.1f}{after * 1e6:>14.1f}{before / after:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
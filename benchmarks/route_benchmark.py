@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Benchmark regresi per route untuk keempat aplikasi lewat Flask test client.
+
+Semua route (/, /health, /metrics, /api/*, endpoint simulasi, POST ingest
+dan job) dijalankan in-process tanpa jaringan; route POST memakai body
+contoh dan route berparameter memakai id/nama contoh dari SAMPLE_REQUESTS.
+Route yang tetap dilewati dicetak beserta alasannya. time.sleep di modul
+aplikasi diganti no-op supaya yang terukur hanya biaya kode. Hasil (ops/detik, p50, p99) dibandingkan
+dengan baseline JSON dan script keluar dengan status 1 bila ada route yang
+lebih lambat dari ambang batas.
+
+Jalankan dari root project:
+    python benchmarks/route_benchmark.py --save-baseline   # rekam baseline mesin ini
+    python benchmarks/route_benchmark.py                   # bandingkan dengan baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from render_benchmark import ROOT, load_app
+
+APPS = ['sample-app', 'ecommerce-app', 'weather-app', 'social-app']
+
+# Route yang sengaja tidak dijalankan beserta alasannya
+SKIPPED_ROUTES = {
+    '/events': 'stream SSE tidak pernah selesai lewat test client',
+    '/static/<path:filename>': 'default Flask, tidak ada folder static (asset dilayani /assets)',
+}
+
+ORDERS_BODY = '\n'.join(json.dumps({'amount': 10 + i * 2.5, 'items': 1 + i % 3}) for i in range(20))
+
+
+def events_body(module):
+    ingest = module.ingest
+    return '\n'.join(json.dumps({ingest.label: value, 'type': kind, 'count': 2})
+                     for value in ingest.values for kind in ingest.kinds)
+
+
+def submitted_job_id(module, client):
+    """Id job yang sudah selesai, untuk GET /jobs/<job_id>"""
+    name = sorted(module.jobs.tasks)[0]
+    job_id = client.post(f'/jobs/{name}').get_json()['id']
+    module.jobs.queue.join()
+    return job_id
+
+
+# Endpoint -> fungsi (module, client) yang mengembalikan (path, kwargs test client)
+SAMPLE_REQUESTS = {
+    'ingest_orders': lambda module, client: (
+        '/api/orders', {'data': ORDERS_BODY, 'content_type': 'application/x-ndjson'}),
+    'ingest_events': lambda module, client: (
+        '/api/events', {'data': events_body(module), 'content_type': 'application/x-ndjson'}),
+    'submit_job': lambda module, client: (f'/jobs/{sorted(module.jobs.tasks)[0]}', {}),
+    'job_status': lambda module, client: (f'/jobs/{submitted_job_id(module, client)}', {}),
+    'api_forecast': lambda module, client: ('/api/forecast/jakarta', {}),
+    'assets': lambda module, client: (module.assets.url_for('dashboard.js'), {}),
+}
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+
+
+class NoSleepTime:
+    """Pengganti modul time di aplikasi: semua fungsi asli kecuali sleep"""
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+    @staticmethod
+    def sleep(seconds):
+        pass
+
+
+def route_requests(module, client):
+    """(nama hasil, method, path, kwargs) untuk setiap route, plus dict route yang dilewati -> alasan"""
+    requests, skipped = [], {}
+    for rule in sorted(module.app.url_map.iter_rules(), key=lambda r: (r.rule, r.endpoint)):
+        method = 'POST' if 'POST' in rule.methods else 'GET'
+        name = rule.rule if method == 'GET' else f'{method} {rule.rule}'
+        if rule.rule in SKIPPED_ROUTES:
+            skipped[name] = SKIPPED_ROUTES[rule.rule]
+        elif rule.endpoint in SAMPLE_REQUESTS:
+            path, kwargs = SAMPLE_REQUESTS[rule.endpoint](module, client)
+            requests.append((name, method, path, kwargs))
+        elif '<' in rule.rule or method != 'GET':
+            skipped[name] = 'tidak ada contoh request di SAMPLE_REQUESTS'
+        else:
+            requests.append((name, method, rule.rule, {}))
+    return requests, skipped
+
+
+def benchmark_routes(module, iterations, warmup):
+    module.time = NoSleepTime()
+    if hasattr(module, 'jobs'):
+        # Antrian tanpa batas: yang diukur jalur submit, bukan jalur 429 saat antrian penuh
+        module.jobs.queue.maxsize = 0
+    client = module.app.test_client()
+    requests, skipped = route_requests(module, client)
+    results = {}
+    for name, method, path, kwargs in requests:
+        send = client.post if method == 'POST' else client.get
+        for _ in range(warmup):
+            send(path, **kwargs)
+
+        timings = []
+        start = time.perf_counter()
+        for _ in range(iterations):
+            began = time.perf_counter()
+            response = send(path, **kwargs)
+            timings.append(time.perf_counter() - began)
+            if response.status_code >= 400:
+                raise RuntimeError(f'{name} returned {response.status_code}')
+        elapsed = time.perf_counter() - start
+
+        timings.sort()
+        results[name] = {
+            'ops_per_sec': round(iterations / elapsed, 1),
+            'p50_us': round(timings[len(timings) // 2] * 1e6, 1),
+            'p99_us': round(timings[min(int(len(timings) * 0.99), len(timings) - 1)] * 1e6, 1),
+        }
+    if hasattr(module, 'jobs'):
+        module.jobs.queue.join()
+    return results, skipped
+
+
+def compare(results, baseline, threshold):
+    """Daftar route yang ops/detik-nya turun lebih dari `threshold` dibanding baseline"""
+    regressions = []
+    for app, routes in results.items():
+        for route, current in routes.items():
+            previous = baseline.get('apps', {}).get(app, {}).get(route)
+            if previous is None:
+                continue
+            change = current['ops_per_sec'] / previous['ops_per_sec'] - 1
+            current['change'] = round(change, 3)
+            if change < -threshold:
+                regressions.append((app, route, previous['ops_per_sec'], current['ops_per_sec'], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=500)
+    parser.add_argument('--warmup', type=int, default=50)
+    parser.add_argument('--apps', default=','.join(APPS))
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='penurunan ops/detik maksimum sebelum dianggap regresi (0.25 = 25%%)')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='tulis hasil run ini sebagai baseline baru')
+    parser.add_argument('--output', help='simpan hasil run ini ke file JSON')
+    args = parser.parse_args()
+
+    results, skipped = {}, {}
+    for folder in args.apps.split(','):
+        results[folder], skipped[folder] = benchmark_routes(load_app(folder), args.iterations, args.warmup)
+
+    report = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'iterations': args.iterations,
+        'apps': results,
+        'skipped': skipped,
+    }
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold) if baseline else []
+
+    print(f"{'app':<16}{'route':<28}{'ops/s':>10}{'p50 us':>10}{'p99 us':>10}{'change':>9}")
+    for folder, routes in results.items():
+        for route, result in routes.items():
+            change = f"{result['change']:+.0%}" if 'change' in result else '-'
+            print(f"{folder:<16}{route:<28}{result['ops_per_sec']:>10}{result['p50_us']:>10}"
+                  f"{result['p99_us']:>10}{change:>9}")
+
+    print("\nRoute yang dilewati:")
+    for folder, routes in skipped.items():
+        for route, reason in routes.items():
+            print(f"  {folder:<16}{route:<28}{reason}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline or baseline is None:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline disimpan ke {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"\nRegresi (> {args.threshold:.0%} lebih lambat dari baseline):")
+        for app, route, before, after, change in regressions:
+            print(f"  {app} {route}: {before} -> {after} ops/s ({change:+.0%})")
+        return 1
+    print("\nTidak ada regresi dibanding baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
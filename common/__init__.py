@@ -0,0 +1 @@
+"""Modul bersama untuk semua aplikasi demo monitoring."""
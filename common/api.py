@@ -0,0 +1,16 @@
+"""Helper response JSON untuk endpoint /api/*."""
+
+import hashlib
+import json
+
+from flask import Response, request
+
+
+def conditional_json(data):
+    """JSON ringkas dengan ETag kuat; balas 304 bila If-None-Match masih cocok"""
+    body = json.dumps(data, separators=(',', ':'), sort_keys=True, ensure_ascii=False).encode('utf-8')
+    response = Response(body, mimetype='application/json')
+    response.set_etag(hashlib.sha1(body).hexdigest())
+    # Klien boleh menyimpan response, tapi harus revalidasi setiap kali
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
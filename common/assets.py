@@ -0,0 +1,82 @@
+"""Static asset dengan fingerprint (content hash), cache immutable, dan varian terkompresi."""
+
+import gzip
+import hashlib
+import os
+
+from flask import Response, abort, request
+
+try:
+    import brotli
+except ImportError:  # brotli opsional, gzip selalu tersedia
+    brotli = None
+
+CONTENT_TYPES = {
+    '.css': 'text/css; charset=utf-8',
+    '.js': 'application/javascript; charset=utf-8',
+}
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+# Asset yang dipakai semua aplikasi (mis. live-stats.js untuk SSE)
+SHARED_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+
+class Asset:
+    """Satu file asset beserta semua varian encoding yang sudah dikompresi"""
+
+    def __init__(self, name, data):
+        self.name = name
+        self.digest = hashlib.sha256(data).hexdigest()[:12]
+        stem, ext = os.path.splitext(name)
+        self.filename = f'{stem}.{self.digest}{ext}'
+        self.content_type = CONTENT_TYPES.get(ext, 'application/octet-stream')
+        self.variants = {'identity': data, 'gzip': gzip.compress(data, compresslevel=9)}
+        if brotli is not None:
+            self.variants['br'] = brotli.compress(data, quality=11)
+
+
+class StaticAssets:
+    """Memuat folder asset saat startup dan melayaninya lewat URL ber-hash.
+
+    Karena URL berubah setiap kali isi file berubah, response boleh di-cache
+    browser selamanya (Cache-Control: immutable). Asset bersama dari
+    common/static ikut dimuat; file aplikasi dengan nama sama menimpanya.
+    """
+
+    def __init__(self, app, folder='assets', url_prefix='/assets'):
+        self.by_name = {}
+        self.by_filename = {}
+        self.url_prefix = url_prefix
+
+        for path in (SHARED_FOLDER, os.path.join(app.root_path, folder)):
+            for name in sorted(os.listdir(path)):
+                with open(os.path.join(path, name), 'rb') as f:
+                    asset = Asset(name, f.read())
+                self.by_name[name] = asset
+                self.by_filename[asset.filename] = asset
+
+        app.add_url_rule(f'{url_prefix}/<filename>', 'assets', self.serve)
+        app.add_template_global(self.url_for, 'asset_url')
+
+    def url_for(self, name):
+        return f'{self.url_prefix}/{self.by_name[name].filename}'
+
+    def choose_encoding(self, asset):
+        accepted = request.accept_encodings
+        for encoding in ('br', 'gzip'):
+            if encoding in asset.variants and accepted[encoding] > 0:
+                return encoding
+        return 'identity'
+
+    def serve(self, filename):
+        asset = self.by_filename.get(filename)
+        if asset is None:
+            abort(404)
+
+        encoding = self.choose_encoding(asset)
+        response = Response(asset.variants[encoding], content_type=asset.content_type)
+        if encoding != 'identity':
+            response.content_encoding = encoding
+        response.set_etag(f'{asset.digest}-{encoding}')
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE
+        response.vary.add('Accept-Encoding')
+        return response.make_conditional(request)
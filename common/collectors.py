@@ -0,0 +1,90 @@
+"""Collector Prometheus yang membaca nilai langsung dari array NumPy.
+
+Satu series cukup satu elemen array plus satu prefix label yang dirender
+sekali, bukan objek Gauge child dengan lock dan value sendiri. Untuk format
+teks, `render_text()` menulis exposition langsung dari array tanpa membuat
+objek Sample per series.
+"""
+
+from itertools import repeat
+
+import numpy as np
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.samples import Sample
+from prometheus_client.utils import floatToGoString
+
+FAMILY_TYPES = {'gauge': GaugeMetricFamily, 'counter': CounterMetricFamily}
+
+
+def _escape(value):
+    return value.replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _format_values(values):
+    """Nilai float dalam format exposition (sama dengan floatToGoString)"""
+    if np.isfinite(values).all() and (np.abs(values) < 1e6).all():
+        return list(map(repr, values.tolist()))
+    return [floatToGoString(value) for value in values.tolist()]
+
+
+class ArrayCollector:
+    """Beberapa metric family yang berbagi satu set label, satu array per family.
+
+    `labelvalues` berisi tuple label untuk setiap series; urutannya sama
+    dengan urutan elemen di setiap array. Nilai diganti per family lewat
+    `set_values()` (swap array utuh) atau dinaikkan lewat `inc()` untuk counter.
+    """
+
+    def __init__(self, labelnames, labelvalues):
+        self.labelnames = list(labelnames)
+        self.labelvalues = [tuple(values) for values in labelvalues]
+        self.families = {}
+        self.values = {}
+        # Label dirender sekali: dict untuk collect(), string untuk render_text()
+        self.labels = [dict(zip(self.labelnames, values)) for values in self.labelvalues]
+        self.labelstrs = ['{' + ','.join(f'{name}="{_escape(value)}"' for name, value in
+                                         sorted(zip(self.labelnames, values))) + '}'
+                          for values in self.labelvalues]
+        self.prefixes = {}
+
+    def __len__(self):
+        return len(self.labelvalues)
+
+    def add_family(self, key, name, documentation, kind='gauge'):
+        """Daftarkan family baru; untuk counter `name` ditulis tanpa akhiran _total"""
+        self.families[key] = (name, documentation, kind)
+        self.values[key] = np.zeros(len(self.labelvalues))
+        sample_name = name + '_total' if kind == 'counter' else name
+        self.prefixes[key] = [f'{sample_name}{labelstr} ' for labelstr in self.labelstrs]
+
+    def set_values(self, values):
+        """Ganti array beberapa family sekaligus (dict key -> array)"""
+        merged = dict(self.values)
+        merged.update({key: np.asarray(array, dtype=float) for key, array in values.items()})
+        self.values = merged
+
+    def inc(self, key, index, amount=1):
+        self.values[key][index] += amount
+
+    def describe(self):
+        return [FAMILY_TYPES[kind](name, documentation, labels=self.labelnames)
+                for name, documentation, kind in self.families.values()]
+
+    def collect(self):
+        values = self.values
+        for key, (name, documentation, kind) in self.families.items():
+            family = FAMILY_TYPES[kind](name, documentation, labels=self.labelnames)
+            sample_name = name + '_total' if kind == 'counter' else name
+            family.samples = [Sample(sample_name, labels, value, None)
+                              for labels, value in zip(self.labels, values[key].tolist())]
+            yield family
+
+    def render_text(self):
+        """Exposition format teks Prometheus langsung dari array"""
+        values = self.values
+        output = []
+        for key, (name, documentation, kind) in self.families.items():
+            sample_name = name + '_total' if kind == 'counter' else name
+            output.append(f'# HELP {sample_name} {documentation}\n# TYPE {sample_name} {kind}\n')
+            output.extend(map(''.join, zip(self.prefixes[key], _format_values(values[key]), repeat('\n'))))
+        return ''.join(output).encode('utf-8')
@@ -0,0 +1,105 @@
+"""Feed aktivitas berkapasitas tetap: ring buffer per proses atau log bersama antar worker."""
+
+import os
+import threading
+import time
+
+from common.sharedlog import SharedLog, shared_path
+
+
+class ActivityFeed:
+    """Ring buffer aktivitas terbaru dengan nomor urut yang terus naik.
+
+    Penulis hanya memegang lock sebentar untuk mengisi satu slot (O(1)).
+    Pembaca tidak memakai lock sama sekali: mereka membaca `head` lalu
+    berjalan mundur dan berhenti begitu menemukan slot yang sudah ditimpa
+    entry yang lebih baru, jadi buffer tidak pernah disalin utuh.
+
+    Buffer hidup di memori satu proses; di mode gunicorn multi-worker pakai
+    SharedActivityFeed (lihat create_feed).
+    """
+
+    def __init__(self, capacity=None):
+        self.capacity = capacity or int(os.environ.get('ACTIVITY_FEED_SIZE', '5000'))
+        self.slots = [None] * self.capacity
+        self.head = 0  # id entry terakhir yang sudah lengkap ditulis
+        self.lock = threading.Lock()
+
+    def add(self, message):
+        with self.lock:
+            entry_id = self.head + 1
+            self.slots[entry_id % self.capacity] = {
+                'id': entry_id,
+                'time': time.strftime("%H:%M:%S"),
+                'message': message,
+            }
+            self.head = entry_id
+        return entry_id
+
+    def _walk(self, head, stop):
+        """Entry dari `head` mundur sampai (tidak termasuk) `stop`, terbaru dulu"""
+        for entry_id in range(head, max(stop, head - self.capacity, 0), -1):
+            entry = self.slots[entry_id % self.capacity]
+            if entry is None or entry['id'] != entry_id:
+                break  # slot sudah ditimpa penulis yang lebih baru
+            yield entry
+
+    def latest(self, limit=10):
+        """`limit` entry terbaru, terbaru dulu (untuk halaman dashboard)"""
+        head = self.head
+        return list(self._walk(head, head - limit))
+
+    def since(self, since=0, limit=100):
+        """Halaman entry dengan id > `since`, urut dari yang terlama.
+
+        Bila `since` sudah keluar dari buffer, halaman dimulai dari entry
+        tertua yang masih ada dan `missed` berisi jumlah entry yang hilang.
+        """
+        head = self.head
+        oldest = max(head - self.capacity + 1, 1)
+        start = max(since + 1, oldest)
+        stop = min(start + limit - 1, head)
+        items = list(self._walk(stop, start - 1))
+        items.reverse()
+        return {
+            'items': items,
+            'next_since': items[-1]['id'] if items else max(since, start - 1),
+            'latest': head,
+            'missed': max(oldest - since - 1, 0),
+        }
+
+
+class SharedActivityFeed:
+    """Feed dengan kontrak sama seperti ActivityFeed, disimpan di SharedLog.
+
+    Semua worker gunicorn menulis ke file yang sama, jadi id entry dan
+    cursor `since` berlaku di worker mana pun yang menjawab request.
+    """
+
+    def __init__(self, path, capacity=None):
+        self.capacity = capacity or int(os.environ.get('ACTIVITY_FEED_SIZE', '5000'))
+        self.log = SharedLog(path, self.capacity)
+
+    def add(self, message):
+        _, entry_id = self.log.append([{'time': time.strftime("%H:%M:%S"), 'message': message}])
+        return entry_id
+
+    def latest(self, limit=10):
+        return [{'id': entry_id, **entry} for entry_id, entry in self.log.latest(limit)]
+
+    def since(self, since=0, limit=100):
+        rows, oldest, head = self.log.since(since, limit)
+        items = [{'id': entry_id, **entry} for entry_id, entry in rows]
+        start = max(since + 1, oldest)
+        return {
+            'items': items,
+            'next_since': items[-1]['id'] if items else max(since, start - 1),
+            'latest': head,
+            'missed': max(oldest - since - 1, 0),
+        }
+
+
+def create_feed(name, capacity=None):
+    """SharedActivityFeed di SHARED_STATE_DIR bila di-set (mode gunicorn), ActivityFeed bila tidak"""
+    path = shared_path(name)
+    return SharedActivityFeed(path, capacity) if path else ActivityFeed(capacity)
@@ -0,0 +1,55 @@
+"""Cache prakiraan cuaca per lokasi yang dihitung sekali per jam."""
+
+import random
+import threading
+import time
+
+CONDITIONS = ["☀️ Sunny", "⛅ Partly Cloudy", "☁️ Cloudy", "🌧️ Rainy", "⛈️ Stormy"]
+
+
+class ForecastCache:
+    """Prakiraan `hours` jam ke depan, di-cache dengan key (lokasi, jam).
+
+    Prakiraan untuk satu jam dihitung sekali saat pertama diminta, lalu dipakai
+    ulang oleh semua request di jam yang sama. Entry jam yang sudah lewat
+    dibuang begitu jam berganti. RNG di-seed dari lokasi dan jam, jadi semua
+    worker gunicorn memberikan prakiraan yang sama.
+    """
+
+    def __init__(self, locations, hours=5):
+        self.locations = locations
+        self.hours = hours
+        self.entries = {}
+        self.current_hour = None
+        self.lock = threading.Lock()
+
+    def compute(self, location, hour):
+        rng = random.Random(f'forecast:{location}:{hour}')
+        forecast = []
+        for i in range(1, self.hours + 1):
+            local_hour = time.localtime((hour + i) * 3600).tm_hour
+            forecast.append({
+                "time": f"{local_hour:02d}:00",
+                "condition": rng.choice(CONDITIONS),
+                "temp": rng.randint(20, 35),
+            })
+        return forecast
+
+    def get(self, location, now=None):
+        """Prakiraan untuk lokasi, raise KeyError bila lokasi tidak dikenal"""
+        if location not in self.locations:
+            raise KeyError(location)
+        hour = int((time.time() if now is None else now) // 3600)
+        key = (location, hour)
+        forecast = self.entries.get(key)
+        if forecast is not None:
+            return forecast
+
+        forecast = self.compute(location, hour)
+        with self.lock:
+            if self.current_hour is None or hour > self.current_hour:
+                # Jam berganti: buang prakiraan jam-jam yang sudah lewat
+                self.entries = {k: v for k, v in self.entries.items() if k[1] >= hour}
+                self.current_hour = hour
+            self.entries[key] = forecast
+        return forecast
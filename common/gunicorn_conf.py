@@ -0,0 +1,39 @@
+"""Konfigurasi gunicorn untuk mode produksi (multi-worker) semua aplikasi demo.
+
+Jalankan dari folder yang berisi app.py:
+    gunicorn -c common/gunicorn_conf.py app:app
+"""
+
+import multiprocessing
+import os
+import shutil
+
+from prometheus_client import multiprocess
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+accesslog = '-'
+
+# gevent (default): mode async, time.sleep di endpoint simulasi di-monkeypatch
+# jadi non-blocking dan koneksi /events (SSE) yang terbuka lama tidak memakan
+# satu thread per viewer. gthread: thread per worker.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gevent')
+if worker_class == 'gevent':
+    worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', '2000'))
+else:
+    threads = int(os.environ.get('GUNICORN_THREADS', '2'))
+
+
+def on_starting(server):
+    # Bersihkan file metrics, status job, dan state bersama sisa run sebelumnya
+    for name in ('PROMETHEUS_MULTIPROC_DIR', 'JOBS_STATE_DIR', 'SHARED_STATE_DIR'):
+        path = os.environ.get(name)
+        if path:
+            shutil.rmtree(path, ignore_errors=True)
+            os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    # Buang gauge "live*" milik worker yang sudah mati
+    multiprocess.mark_process_dead(worker.pid)
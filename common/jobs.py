@@ -0,0 +1,200 @@
+"""Antrian job background untuk endpoint simulasi yang lama.
+
+Request hanya memasukkan job ke antrian lalu langsung mendapat job id;
+sekumpulan worker thread dengan jumlah tetap yang menjalankan job-nya.
+Bila antrian penuh, request ditolak dengan 429 (backpressure).
+"""
+
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from flask import jsonify, url_for
+from prometheus_client import Counter, Gauge, Histogram
+
+JOB_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0, 30.0)
+
+
+class Job:
+    def __init__(self, name, func):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.func = func
+        self.status = 'queued'
+        self.result = None
+        self.error = None
+        self.enqueued_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'job': self.name,
+            'status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'enqueued_at': self.enqueued_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class JobQueue:
+    """Antrian terbatas + worker pool untuk fungsi simulasi sebuah aplikasi.
+
+    Status job disimpan di memori proses. Bila JOBS_STATE_DIR di-set (mode
+    gunicorn multi-worker), status juga ditulis sebagai file JSON supaya
+    /jobs/<id> bisa dijawab oleh worker mana pun.
+    """
+
+    def __init__(self, app, prefix, tasks, workers=None, max_size=None, history=1000):
+        self.tasks = tasks
+        self.workers = workers or int(os.environ.get('JOB_WORKERS', '4'))
+        self.queue = queue.Queue(maxsize=max_size or int(os.environ.get('JOB_QUEUE_SIZE', '100')))
+        self.history = history
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        self.threads = []
+        self.state_dir = os.environ.get('JOBS_STATE_DIR')
+
+        self.queue_depth = Gauge(f'{prefix}_job_queue_depth', 'Jobs waiting in the queue',
+                                 multiprocess_mode='livesum')
+        self.wait_time = Histogram(f'{prefix}_job_wait_seconds', 'Time jobs spend queued',
+                                   ['job'], buckets=JOB_BUCKETS)
+        self.run_time = Histogram(f'{prefix}_job_run_seconds', 'Time jobs spend running',
+                                  ['job'], buckets=JOB_BUCKETS)
+        self.jobs_total = Counter(f'{prefix}_jobs_total', 'Jobs by final status', ['job', 'status'])
+
+        app.add_url_rule('/jobs/<name>', 'submit_job', self.submit_view, methods=['POST'])
+        app.add_url_rule('/jobs/<job_id>', 'job_status', self.status_view, methods=['GET'])
+
+    def start(self):
+        # Thread dibuat saat job pertama masuk, bukan saat import, supaya
+        # aman dipakai setelah fork worker gunicorn
+        with self.lock:
+            if self.threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self.worker_loop, name=f'job-worker-{i}', daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def submit(self, name):
+        """Masukkan job ke antrian, raise queue.Full bila antrian penuh"""
+        self.start()
+        job = Job(name, self.tasks[name])
+        # Snapshot 'queued' ditulis sebelum job terlihat oleh worker thread;
+        # bila sesudahnya, snapshot itu bisa menimpa status running/completed
+        self.remember(job)
+        self.queue_depth.inc()
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            self.queue_depth.dec()
+            self.discard(job)
+            self.jobs_total.labels(job=name, status='rejected').inc()
+            raise
+        return job
+
+    def get(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        if self.state_dir:
+            try:
+                with open(os.path.join(self.state_dir, f'{job_id}.json')) as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        return None
+
+    def remember(self, job):
+        with self.lock:
+            self.jobs[job.id] = job
+            while len(self.jobs) > self.history:
+                _, old = self.jobs.popitem(last=False)
+                self.forget(old)
+        self.persist(job)
+
+    def discard(self, job):
+        """Buang job yang batal masuk antrian"""
+        with self.lock:
+            self.jobs.pop(job.id, None)
+        self.forget(job)
+
+    def persist(self, job):
+        if not self.state_dir:
+            return
+        os.makedirs(self.state_dir, exist_ok=True)
+        # Nama file sementara unik per penulis: thread pool satu proses
+        # berbagi pid, jadi nama berbasis pid bisa saling menimpa
+        fd, tmp = tempfile.mkstemp(dir=self.state_dir, prefix=f'.{job.id}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(job.to_dict(), f)
+            os.replace(tmp, os.path.join(self.state_dir, f'{job.id}.json'))
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    def forget(self, job):
+        if self.state_dir:
+            try:
+                os.remove(os.path.join(self.state_dir, f'{job.id}.json'))
+            except OSError:
+                pass
+
+    def worker_loop(self):
+        while True:
+            job = self.queue.get()
+            self.queue_depth.dec()
+            job.started_at = time.time()
+            job.status = 'running'
+            self.wait_time.labels(job=job.name).observe(job.started_at - job.enqueued_at)
+            try:
+                self.persist(job)
+                with self.run_time.labels(job=job.name).time():
+                    job.result = job.func()
+                job.status = 'completed'
+                job.finished_at = time.time()
+                self.persist(job)
+            except Exception as exc:
+                job.error = str(exc)
+                job.status = 'failed'
+                job.finished_at = job.finished_at or time.time()
+                try:
+                    self.persist(job)
+                except OSError:
+                    # Status gagal tetap ada di memori proses ini
+                    pass
+            self.jobs_total.labels(job=job.name, status=job.status).inc()
+            self.queue.task_done()
+
+    def submit_view(self, name):
+        if name not in self.tasks:
+            return jsonify({'error': f'unknown job {name}', 'jobs': sorted(self.tasks)}), 404
+        try:
+            job = self.submit(name)
+        except queue.Full:
+            response = jsonify({'error': 'job queue is full'})
+            response.status_code = 429
+            response.headers['Retry-After'] = '1'
+            return response
+        status_url = url_for('job_status', job_id=job.id)
+        return jsonify({'id': job.id, 'status': job.status, 'status_url': status_url}), 202, {'Location': status_url}
+
+    def status_view(self, job_id):
+        job = self.get(job_id)
+        if job is None:
+            return jsonify({'error': 'job not found'}), 404
+        return jsonify(job)
@@ -0,0 +1,197 @@
+"""Helper exposition Prometheus yang dipakai bersama oleh semua aplikasi."""
+
+import glob
+import gzip
+import os
+import threading
+
+from flask import Response, request
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest, multiprocess
+from prometheus_client.openmetrics import exposition as openmetrics
+
+from common.protobuf import CONTENT_TYPE_PROTOBUF, generate_protobuf
+
+try:
+    import zstandard
+except ImportError:  # zstd opsional, gzip selalu tersedia
+    zstandard = None
+
+COMPRESSORS = {'gzip': lambda data: gzip.compress(data, compresslevel=6)}
+if zstandard is not None:
+    COMPRESSORS['zstd'] = zstandard.ZstdCompressor(level=3).compress
+
+
+def multiprocess_enabled():
+    """True bila aplikasi berjalan di bawah gunicorn dengan mode multiprocess"""
+    return bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+
+def read_livesum(names):
+    """Nilai gauge livesum `names` dijumlahkan dari semua worker yang masih hidup.
+
+    Dict (nama sample, tuple label terurut) -> nilai. File worker yang
+    sudah mati dihapus oleh child_exit (gunicorn_conf.py), jadi tidak ikut.
+    """
+    files = glob.glob(os.path.join(os.environ['PROMETHEUS_MULTIPROC_DIR'], 'gauge_livesum_*.db'))
+    values = {}
+    for metric in multiprocess.MultiProcessCollector.merge(files, accumulate=False):
+        if metric.name in names:
+            for sample in metric.samples:
+                values[(sample.name, tuple(sorted(sample.labels.items())))] = sample.value
+    return values
+
+
+# Collector array (common/collectors.py) yang membaca state proses sendiri.
+# Nilainya dihitung dari tick yang sama di semua worker, jadi cukup diambil
+# dari worker yang menjawab scrape.
+LOCAL_COLLECTORS = []
+
+
+def register_collector(collector):
+    """Daftarkan collector lokal (ArrayCollector, TopKCollector) supaya ikut di /metrics"""
+    LOCAL_COLLECTORS.append(collector)
+
+
+# Urutan sample dalam satu label set histogram/summary yang diminta OpenMetrics
+SAMPLE_ORDER = {'': 0, '_bucket': 0, '_gcount': 1, '_count': 1, '_gsum': 2, '_sum': 2, '_created': 3}
+
+
+def _sample_key(metric):
+    def key(sample):
+        labels = tuple(sorted((k, v) for k, v in sample.labels.items() if k not in ('le', 'quantile')))
+        bound = sample.labels.get('le', sample.labels.get('quantile'))
+        return labels, SAMPLE_ORDER.get(sample.name[len(metric.name):], 4), float(bound) if bound else 0.0
+    return key
+
+
+class GroupedMultiProcessCollector:
+    """MultiProcessCollector dengan sample histogram/summary dikelompokkan per label set.
+
+    MultiProcessCollector menulis semua `_sum` (dan `_count` summary) sebelum
+    `_bucket`, padahal OpenMetrics mewajibkan sample satu label set
+    berurutan: bucket (le naik), count, lalu sum.
+    """
+
+    def __init__(self, path=None):
+        self.collector = multiprocess.MultiProcessCollector(None, path)
+
+    def collect(self):
+        for metric in self.collector.collect():
+            if metric.type in ('histogram', 'gaugehistogram', 'summary'):
+                metric.samples.sort(key=_sample_key(metric))
+            yield metric
+
+
+def get_registry(local=True):
+    """Registry untuk /metrics, gabungan semua worker bila mode multiprocess aktif"""
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        registry.register(GroupedMultiProcessCollector())
+    elif local and LOCAL_COLLECTORS:
+        registry = CollectorRegistry()
+        registry.register(REGISTRY)
+    else:
+        return REGISTRY
+    if local:
+        for collector in LOCAL_COLLECTORS:
+            registry.register(collector)
+    return registry
+
+
+def render_collector(collector):
+    """Format teks satu collector lokal, lewat render_text() bila tersedia"""
+    if hasattr(collector, 'render_text'):
+        return collector.render_text()
+    registry = CollectorRegistry(auto_describe=False)
+    registry.register(collector)
+    return generate_latest(registry)
+
+
+def generate_text():
+    """Format teks: generate_latest() untuk metric biasa, collector array dirender langsung"""
+    output = generate_latest(get_registry(local=False))
+    return output + b''.join(render_collector(collector) for collector in LOCAL_COLLECTORS)
+
+
+FORMATS = {
+    'text': (generate_text, CONTENT_TYPE_LATEST),
+    'openmetrics': (lambda: openmetrics.generate_latest(get_registry()), openmetrics.CONTENT_TYPE_LATEST),
+    'protobuf': (lambda: generate_protobuf(get_registry()), CONTENT_TYPE_PROTOBUF),
+}
+
+
+def choose_format(accept_header):
+    """Pilih format exposition dari header Accept (q tertinggi menang)"""
+    best, best_q = 'text', -1.0
+    for part in (accept_header or '').split(','):
+        media, *raw_params = [p.strip() for p in part.split(';')]
+        params = dict(p.split('=', 1) for p in raw_params if '=' in p)
+        try:
+            q = float(params.get('q', 1))
+        except ValueError:
+            continue
+
+        if (media == 'application/vnd.google.protobuf'
+                and params.get('proto') == 'io.prometheus.client.MetricFamily'
+                and params.get('encoding') == 'delimited'):
+            fmt = 'protobuf'
+        elif media == 'application/openmetrics-text':
+            fmt = 'openmetrics'
+        elif media in ('text/plain', '*/*'):
+            fmt = 'text'
+        else:
+            continue
+
+        if q > best_q:
+            best, best_q = fmt, q
+    return best
+
+
+def choose_encoding(accept_encodings):
+    for encoding in ('zstd', 'gzip'):
+        if encoding in COMPRESSORS and accept_encodings[encoding] > 0:
+            return encoding
+    return 'identity'
+
+
+class ExpositionCache:
+    """Output /metrics yang sudah diserialisasi, dibangun ulang paling banyak sekali per tick.
+
+    Setiap kombinasi format (text, OpenMetrics, protobuf) dan encoding
+    (identity, gzip, zstd) disimpan terpisah, jadi banyak scraper dalam satu
+    tick hanya membayar serialisasi dan kompresi sekali.
+    """
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+        self.generation = None
+        self.variants = {}
+        self.lock = threading.Lock()
+
+    def build(self, fmt, encoding):
+        payload = self.variants.get((fmt, encoding))
+        if payload is None:
+            if encoding == 'identity':
+                payload = FORMATS[fmt][0]()
+            else:
+                payload = COMPRESSORS[encoding](self.build(fmt, 'identity'))
+            self.variants[(fmt, encoding)] = payload
+        return payload
+
+    def get(self, fmt='text', encoding='identity'):
+        generation = self.ticker.generation
+        with self.lock:
+            if generation != self.generation:
+                self.variants = {}
+                self.generation = generation
+            return self.build(fmt, encoding)
+
+    def response(self):
+        """Response /metrics sesuai header Accept dan Accept-Encoding request"""
+        fmt = choose_format(request.headers.get('Accept'))
+        encoding = choose_encoding(request.accept_encodings)
+        response = Response(self.get(fmt, encoding), content_type=FORMATS[fmt][1])
+        if encoding != 'identity':
+            response.content_encoding = encoding
+        response.vary.update(('Accept', 'Accept-Encoding'))
+        return response
@@ -0,0 +1,253 @@
+"""Order store berbasis array kolom dan agregat sliding window yang di-update inkremental."""
+
+import json
+import os
+import threading
+import time
+
+import numpy as np
+from prometheus_client import Gauge
+
+from common.metrics import multiprocess_enabled, read_livesum
+from common.sharedlog import SharedLog
+
+# Status order; `abandoned` adalah keranjang yang tidak jadi checkout
+STATUSES = ('completed', 'pending', 'cancelled', 'abandoned')
+WINDOWS = {'1m': 60, '5m': 300, '1h': 3600}
+# Batas per order: muat di kolom int32/int64 dan jumlah window tidak overflow
+MAX_AMOUNT_CENTS = 100_000_000  # $1.000.000
+MAX_ITEMS = 10_000
+
+
+def parse_orders(body):
+    """Order dari body JSON (satu objek atau array) atau NDJSON, list (amount_cents, items, status)"""
+    text = body.strip()
+    if text.startswith(b'['):
+        records = json.loads(text)
+        if not isinstance(records, list):
+            raise ValueError('expected a JSON array of orders')
+    else:
+        # NDJSON (atau satu objek): setiap baris harus tepat satu objek JSON
+        records = []
+        for number, line in enumerate(text.split(b'\n'), 1):
+            if line.strip():
+                try:
+                    records.append(json.loads(line))
+                except ValueError as exc:
+                    raise ValueError(f'line {number}: {exc}') from None
+
+    orders = []
+    for number, record in enumerate(records, 1):
+        try:
+            amount = record['amount']
+            items = record.get('items', 1)
+            status = record.get('status', 'completed')
+        except (KeyError, TypeError, AttributeError):
+            raise ValueError(f'order {number}: expected an object with "amount"') from None
+        if type(amount) not in (int, float) or not 0 <= amount * 100 <= MAX_AMOUNT_CENTS:
+            raise ValueError(f'order {number}: amount must be between 0 and {MAX_AMOUNT_CENTS // 100}, got {amount!r}')
+        if type(items) is not int or not 0 <= items <= MAX_ITEMS:
+            raise ValueError(f'order {number}: items must be an integer between 0 and {MAX_ITEMS}, got {items!r}')
+        if status not in STATUSES:
+            raise ValueError(f'order {number}: unknown status {status!r}')
+        orders.append((round(amount * 100), items, status))
+    return orders
+
+
+class RollingWindows:
+    """Jumlah beberapa field untuk beberapa sliding window sekaligus.
+
+    Nilai dicatat di bucket per detik (ring sepanjang window terbesar) dan
+    setiap window menyimpan jumlah berjalan. Saat waktu maju, bucket yang
+    keluar dari window dikurangkan dari jumlahnya, jadi `totals()` O(1)
+    berapa pun jumlah event di dalam window. Semua nilai integer supaya
+    penambahan dan pengurangan tidak menumpuk error pembulatan.
+    """
+
+    def __init__(self, fields, windows=None):
+        self.fields = list(fields)
+        self.windows = dict(windows or WINDOWS)
+        self.size = max(self.windows.values())
+        self.buckets = np.zeros((self.size, len(self.fields)), dtype=np.int64)
+        self.sums = {name: np.zeros(len(self.fields), dtype=np.int64) for name in self.windows}
+        self.second = None
+        self.lock = threading.Lock()
+
+    def _advance(self, second):
+        if self.second is None or second - self.second >= self.size:
+            self.buckets[:] = 0
+            for sums in self.sums.values():
+                sums[:] = 0
+        elif second > self.second:
+            for current in range(self.second + 1, second + 1):
+                # Bucket `current - length` baru saja keluar dari window tersebut;
+                # untuk window terbesar itu adalah slot yang akan dipakai ulang
+                for name, length in self.windows.items():
+                    self.sums[name] -= self.buckets[(current - length) % self.size]
+                self.buckets[current % self.size] = 0
+        else:
+            return
+        self.second = second
+
+    def add(self, values, now=None):
+        """Tambahkan vektor nilai (urutan `fields`) ke detik `now`"""
+        second = int(time.time() if now is None else now)
+        with self.lock:
+            self._advance(second)
+            self.buckets[second % self.size] += values
+            for sums in self.sums.values():
+                sums += values
+
+    def totals(self, window, now=None):
+        """Jumlah setiap field di window, dict field -> nilai"""
+        second = int(time.time() if now is None else now)
+        with self.lock:
+            self._advance(second)
+            values = self.sums[window].tolist()
+        return dict(zip(self.fields, values))
+
+
+def window_kpis(totals):
+    """KPI dari jumlah window (dict field -> nilai): revenue, order per status, rata-rata item, konversi (%)"""
+    orders = {status: totals[f'orders_{status}'] for status in STATUSES}
+    placed = sum(orders.values())
+    return {
+        'revenue': totals['revenue_cents'] / 100,
+        'orders': orders,
+        'basket_size': totals['items'] / placed if placed else 0.0,
+        'conversion_rate': orders['completed'] / placed * 100 if placed else 0.0,
+    }
+
+
+class OrderStore:
+    """Order terbaru dalam array kolom berkapasitas tetap plus jumlah per window.
+
+    Satu order hanya beberapa elemen array (id, waktu, nilai dalam sen,
+    jumlah item, status), bukan dict per order. Bila `path` diberikan (mode
+    gunicorn, lihat shared_path), order terbaru disimpan di SharedLog
+    sehingga id unik dan /api/orders sama di semua worker; array kolom
+    tidak dipakai. Jumlah window selalu per proses, gabungannya lewat
+    WindowMetrics.
+    """
+
+    def __init__(self, capacity=None, windows=None, path=None):
+        self.capacity = capacity or int(os.environ.get('ORDER_STORE_SIZE', '100000'))
+        self.log = SharedLog(path, self.capacity) if path else None
+        if self.log is None:
+            self.times = np.zeros(self.capacity)
+            self.amounts = np.zeros(self.capacity, dtype=np.int64)  # sen
+            self.items = np.zeros(self.capacity, dtype=np.int32)
+            self.statuses = np.zeros(self.capacity, dtype=np.uint8)
+        self.head = 0
+        self.status_index = {status: i for i, status in enumerate(STATUSES)}
+        self.windows = RollingWindows(['revenue_cents', 'items'] + [f'orders_{s}' for s in STATUSES], windows)
+        self.lock = threading.Lock()
+
+    def add_batch(self, orders, now=None):
+        """Simpan list (amount_cents, items, status) sekaligus, kembalikan id pertama dan terakhir.
+
+        Seluruh batch divalidasi dan dikonversi ke array dulu; bila ada satu
+        order tidak valid (ValueError) store tidak berubah sama sekali.
+        """
+        now = time.time() if now is None else now
+        for amount, items, status in orders:
+            if not (0 <= amount <= MAX_AMOUNT_CENTS and 0 <= items <= MAX_ITEMS and status in self.status_index):
+                raise ValueError(f'invalid order {(amount, items, status)!r}')
+        amounts = np.array([amount for amount, _, _ in orders], dtype=np.int64)
+        items = np.array([items for _, items, _ in orders], dtype=np.int32)
+        statuses = np.array([self.status_index[status] for _, _, status in orders], dtype=np.uint8)
+
+        totals = np.zeros(len(self.windows.fields), dtype=np.int64)
+        totals[0] = amounts[statuses == self.status_index['completed']].sum()
+        totals[1] = items.sum(dtype=np.int64)
+        totals[2:] = np.bincount(statuses, minlength=len(STATUSES))
+
+        if self.log is not None:
+            first, last = self.log.append({'time': now, 'amount': amount / 100, 'items': items, 'status': status}
+                                          for amount, items, status in orders)
+        else:
+            with self.lock:
+                first = self.head + 1
+                # Batch lebih besar dari ring: hanya `capacity` order terakhir yang tersisa
+                keep = slice(max(len(orders) - self.capacity, 0), None)
+                slots = np.arange(first, first + len(orders))[keep] % self.capacity
+                self.times[slots] = now
+                self.amounts[slots] = amounts[keep]
+                self.items[slots] = items[keep]
+                self.statuses[slots] = statuses[keep]
+                self.head += len(orders)
+                last = self.head
+        self.windows.add(totals, now)
+        return first, last
+
+    def kpis(self, window, now=None):
+        """KPI satu window dari jumlah berjalan proses ini"""
+        return window_kpis(self.windows.totals(window, now))
+
+    def recent(self, limit=10):
+        """`limit` order terbaru, terbaru dulu"""
+        if self.log is not None:
+            return [{'id': order_id, **order} for order_id, order in self.log.latest(min(limit, self.capacity))]
+        with self.lock:
+            head = self.head
+            ids = range(head, max(head - min(limit, self.capacity), 0), -1)
+            return [{
+                'id': order_id,
+                'time': float(self.times[order_id % self.capacity]),
+                'amount': int(self.amounts[order_id % self.capacity]) / 100,
+                'items': int(self.items[order_id % self.capacity]),
+                'status': STATUSES[self.statuses[order_id % self.capacity]],
+            } for order_id in ids]
+
+
+class WindowMetrics:
+    """Jumlah window setiap worker sebagai gauge livesum `<prefix>_window_*`.
+
+    Prometheus menjumlahkan gauge semua worker saat scrape, dan `totals()`
+    membaca jumlah gabungan yang sama dari file multiprocess. Rasio
+    (konversi, isi keranjang, nilai order rata-rata) dihitung dari jumlah
+    gabungan, bukan dirata-rata antar worker; di Prometheus lewat recording
+    rule job_window:ecommerce_*.
+    """
+
+    def __init__(self, store, prefix):
+        self.store = store
+        self.revenue = Gauge(f'{prefix}_window_revenue_usd', 'Revenue from completed orders in the sliding window',
+                             ['window'], multiprocess_mode='livesum')
+        self.items = Gauge(f'{prefix}_window_items', 'Items ordered in the sliding window',
+                           ['window'], multiprocess_mode='livesum')
+        self.orders = Gauge(f'{prefix}_window_orders', 'Orders in the sliding window by status',
+                            ['window', 'status'], multiprocess_mode='livesum')
+        self.names = {self.revenue._name, self.items._name, self.orders._name}
+
+    def publish(self, now=None):
+        """Tulis jumlah window proses ini; dipanggil setelah batch dan setiap tick (window bergeser)"""
+        for window in self.store.windows.windows:
+            totals = self.store.windows.totals(window, now)
+            self.revenue.labels(window=window).set(totals['revenue_cents'] / 100)
+            self.items.labels(window=window).set(totals['items'])
+            for status in STATUSES:
+                self.orders.labels(window=window, status=status).set(totals[f'orders_{status}'])
+
+    def totals(self):
+        """Jumlah setiap window dari semua worker, dict window -> (format RollingWindows.totals)"""
+        windows = self.store.windows.windows
+        if not multiprocess_enabled():
+            return {window: self.store.windows.totals(window) for window in windows}
+        values = read_livesum(self.names)
+        result = {}
+        for window in windows:
+            key = (('window', window),)
+            totals = {
+                'revenue_cents': round(values.get((self.revenue._name, key), 0) * 100),
+                'items': round(values.get((self.items._name, key), 0)),
+            }
+            for status in STATUSES:
+                labels = (('status', status), ('window', window))
+                totals[f'orders_{status}'] = round(values.get((self.orders._name, labels), 0))
+            result[window] = totals
+        return result
+
+    def kpis(self):
+        """KPI setiap window dari jumlah semua worker, dict window -> KPI"""
+        return {window: window_kpis(totals) for window, totals in self.totals().items()}
@@ -0,0 +1,145 @@
+"""Encoder format exposition protobuf Prometheus (io.prometheus.client.MetricFamily).
+
+prometheus_client hanya mendukung format teks, jadi pesan protobuf di sini
+ditulis manual mengikuti metrics.proto: setiap MetricFamily diawali panjang
+pesan dalam varint (encoding=delimited).
+"""
+
+import struct
+
+CONTENT_TYPE_PROTOBUF = ('application/vnd.google.protobuf; '
+                         'proto=io.prometheus.client.MetricFamily; encoding=delimited')
+
+# enum MetricType
+COUNTER, GAUGE, SUMMARY, UNTYPED, HISTOGRAM = 0, 1, 2, 3, 4
+
+# Wire type protobuf
+VARINT, FIXED64, LENGTH_DELIMITED = 0, 1, 2
+
+
+def _varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _key(field, wire_type):
+    return _varint(field << 3 | wire_type)
+
+
+def _uint(field, value):
+    return _key(field, VARINT) + _varint(int(value))
+
+
+def _double(field, value):
+    return _key(field, FIXED64) + struct.pack('<d', value)
+
+
+def _bytes(field, data):
+    return _key(field, LENGTH_DELIMITED) + _varint(len(data)) + data
+
+
+def _string(field, value):
+    return _bytes(field, value.encode('utf-8'))
+
+
+def _labels(labels):
+    return b''.join(_bytes(1, _string(1, name) + _string(2, value))
+                    for name, value in sorted(labels.items()))
+
+
+def _metric(labels, field, body, timestamp=None):
+    data = _labels(labels) + _bytes(field, body)
+    if timestamp is not None:
+        data += _uint(6, int(timestamp * 1000))
+    return data
+
+
+def _group(samples, suffixes, drop_label=None):
+    """Kelompokkan sample histogram/summary per label set (tanpa label le/quantile)"""
+    groups = {}
+    for sample in samples:
+        labels = {k: v for k, v in sample.labels.items() if k != drop_label}
+        key = tuple(sorted(labels.items()))
+        group = groups.setdefault(key, {'labels': labels, 'points': []})
+        for suffix in suffixes:
+            if sample.name.endswith(suffix):
+                group['points'].append((suffix, sample))
+                break
+    return groups.values()
+
+
+def _simple_family(metric, name, metric_type, field):
+    metrics = [
+        _metric(sample.labels, field, _double(1, sample.value), sample.timestamp)
+        for sample in metric.samples
+        if sample.name == name
+    ]
+    return name, metric_type, metrics
+
+
+def _histogram_family(metric):
+    metrics = []
+    for group in _group(metric.samples, ('_bucket', '_count', '_sum'), drop_label='le'):
+        count, total, buckets = 0, 0.0, b''
+        for suffix, sample in group['points']:
+            if suffix == '_count':
+                count = sample.value
+            elif suffix == '_sum':
+                total = sample.value
+            elif sample.labels['le'] != '+Inf':
+                buckets += _bytes(3, _uint(1, sample.value) + _double(2, float(sample.labels['le'])))
+        body = _uint(1, count) + _double(2, total) + buckets
+        metrics.append(_metric(group['labels'], 7, body))
+    return metric.name, HISTOGRAM, metrics
+
+
+def _summary_family(metric):
+    metrics = []
+    for group in _group(metric.samples, ('_count', '_sum', ''), drop_label='quantile'):
+        count, total, quantiles = 0, 0.0, b''
+        for suffix, sample in group['points']:
+            if suffix == '_count':
+                count = sample.value
+            elif suffix == '_sum':
+                total = sample.value
+            elif 'quantile' in sample.labels:
+                quantiles += _bytes(3, _double(1, float(sample.labels['quantile'])) + _double(2, sample.value))
+        body = _uint(1, count) + _double(2, total) + quantiles
+        metrics.append(_metric(group['labels'], 4, body))
+    return metric.name, SUMMARY, metrics
+
+
+def _family(metric):
+    if metric.type == 'counter':
+        return _simple_family(metric, metric.name + '_total', COUNTER, 3)
+    if metric.type == 'gauge':
+        return _simple_family(metric, metric.name, GAUGE, 2)
+    if metric.type == 'histogram':
+        return _histogram_family(metric)
+    if metric.type == 'summary':
+        return _summary_family(metric)
+    if metric.type == 'info':
+        return _simple_family(metric, metric.name + '_info', GAUGE, 2)
+    if metric.type in ('stateset', 'gaugehistogram'):
+        return _simple_family(metric, metric.name, GAUGE, 2)
+    return _simple_family(metric, metric.name, UNTYPED, 5)
+
+
+def generate_protobuf(registry):
+    """Serialisasi registry ke rangkaian MetricFamily yang length-delimited"""
+    output = bytearray()
+    for metric in registry.collect():
+        name, metric_type, metrics = _family(metric)
+        if not metrics:
+            continue
+        family = _string(1, name) + _string(2, metric.documentation) + _uint(3, metric_type)
+        family += b''.join(_bytes(4, m) for m in metrics)
+        output += _varint(len(family)) + family
+    return bytes(output)
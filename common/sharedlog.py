@@ -0,0 +1,80 @@
+"""Log append-only berkapasitas tetap di file SQLite, dipakai bersama semua worker gunicorn."""
+
+import json
+import os
+import sqlite3
+import threading
+
+
+def shared_path(name):
+    """Path file SQLite `name` di SHARED_STATE_DIR, None bila tidak di-set (satu proses)"""
+    shared_dir = os.environ.get('SHARED_STATE_DIR')
+    return os.path.join(shared_dir, f'{name}.sqlite3') if shared_dir else None
+
+
+class SharedLog:
+    """Entry JSON dengan id yang unik dan terus naik lintas proses.
+
+    Id dibagikan di dalam transaksi `BEGIN IMMEDIATE`, jadi dua worker yang
+    menulis bersamaan tidak pernah mendapat id yang sama. Entry lama dibuang
+    begitu jumlahnya melewati `capacity`. Mode WAL membuat pembaca tidak
+    menunggu penulis.
+    """
+
+    def __init__(self, path, capacity):
+        self.path = path
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.pid = None
+        self.conn = None
+
+    def connection(self):
+        # Koneksi SQLite tidak boleh dibawa melewati fork: buat ulang per proses
+        if self.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            try:
+                conn.execute('PRAGMA journal_mode=WAL')
+            except sqlite3.OperationalError:
+                pass  # worker lain sedang mengganti mode yang sama
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS entries (id INTEGER PRIMARY KEY, data TEXT NOT NULL)')
+            self.conn, self.pid = conn, os.getpid()
+        return self.conn
+
+    def append(self, records):
+        """Tambahkan record, kembalikan (id pertama, id terakhir)"""
+        rows = [json.dumps(record) for record in records]
+        with self.lock:
+            conn = self.connection()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                head = conn.execute('SELECT COALESCE(MAX(id), 0) FROM entries').fetchone()[0]
+                conn.executemany('INSERT INTO entries (id, data) VALUES (?, ?)', enumerate(rows, head + 1))
+                conn.execute('DELETE FROM entries WHERE id <= ?', (head + len(rows) - self.capacity,))
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        return head + 1, head + len(rows)
+
+    def latest(self, limit):
+        """List (id, record) terbaru, terbaru dulu"""
+        with self.lock:
+            rows = self.connection().execute(
+                'SELECT id, data FROM entries ORDER BY id DESC LIMIT ?', (limit,)).fetchall()
+        return [(entry_id, json.loads(data)) for entry_id, data in rows]
+
+    def since(self, since, limit):
+        """(list (id, record) dengan id > `since` urut naik, id tertua, id terbaru) dari satu snapshot"""
+        with self.lock:
+            conn = self.connection()
+            conn.execute('BEGIN')
+            try:
+                oldest, head = conn.execute('SELECT MIN(id), MAX(id) FROM entries').fetchone()
+                rows = conn.execute('SELECT id, data FROM entries WHERE id > ? ORDER BY id LIMIT ?',
+                                    (since, limit)).fetchall()
+            finally:
+                conn.execute('COMMIT')
+        head = head or 0
+        return [(entry_id, json.loads(data)) for entry_id, data in rows], oldest or head + 1, head
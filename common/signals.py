@@ -0,0 +1,155 @@
+"""Generator sinyal sintetis yang berkorelasi terhadap waktu, tervektorisasi untuk banyak series.
+
+Nilai berurutan dari satu series saling berdekatan (random walk,
+Ornstein-Uhlenbeck, pola harian, counter monoton), bukan undian acak
+independen setiap tick. Data seperti ini jauh lebih mudah dikompresi oleh
+chunk delta/XOR Prometheus, jadi uji kapasitas storage lebih realistis.
+
+Setiap generator bekerja pada array berukuran `size` dan dipanggil sekali per
+tick dengan `signal(t, rng)`: `t` adalah waktu tick (detik epoch) dan `rng`
+adalah numpy Generator yang di-seed dari tick (lihat Ticker).
+"""
+
+import hashlib
+import math
+import time
+
+import numpy as np
+
+DAY = 86400.0
+
+# Jumlah tick yang diputar ulang saat ticker start supaya state generator
+# (OU) di semua worker gunicorn konvergen ke nilai yang sama
+WARMUP_TICKS = 300
+
+
+def numpy_rng(rng):
+    """Generator NumPy yang di-seed dari RNG tick, jadi semua worker tetap sinkron"""
+    return np.random.default_rng(rng.getrandbits(64))
+
+
+def seeded_uniform(name, low, high, size):
+    """Parameter per series yang stabil (sama di semua worker dan setiap restart)"""
+    seed = int.from_bytes(hashlib.sha256(name.encode('utf-8')).digest()[:8], 'little')
+    return np.random.default_rng(seed).uniform(low, high, size)
+
+
+def _value(param, t, rng):
+    """Parameter boleh berupa angka, array, atau generator lain (misalnya mean OU yang diurnal)"""
+    return param(t, rng) if callable(param) else param
+
+
+class Diurnal:
+    """Pola harian: base + amplitude * cos, puncak di `peak_hour` waktu lokal. Tanpa state."""
+
+    def __init__(self, base, amplitude, peak_hour=14.0, period=DAY, size=1):
+        self.base = np.broadcast_to(np.asarray(base, dtype=float), (size,))
+        self.amplitude = amplitude
+        self.peak = peak_hour * 3600.0
+        self.period = period
+        self.offset = -time.timezone
+
+    def __call__(self, t, rng):
+        phase = 2 * math.pi * ((t + self.offset - self.peak) % self.period) / self.period
+        return self.base + self.amplitude * math.cos(phase)
+
+
+class OrnsteinUhlenbeck:
+    """Proses Ornstein-Uhlenbeck: berfluktuasi di sekitar `mean` dan selalu kembali ke sana.
+
+    `theta` adalah kecepatan kembali ke mean (per detik) dan `sigma` besar
+    noise per akar detik. Karena sifat mean-reverting ini, dua worker yang
+    memutar ulang tick yang sama akan konvergen meskipun start di waktu berbeda.
+    """
+
+    def __init__(self, mean, theta, sigma, size=1, low=None, high=None):
+        self.mean = mean
+        self.theta = theta
+        self.sigma = sigma
+        self.size = size
+        self.low = low
+        self.high = high
+        self.state = None
+        self.last_t = None
+
+    def __call__(self, t, rng):
+        mean = _value(self.mean, t, rng)
+        # Noise selalu diambil supaya urutan undian per tick sama di semua worker
+        noise = rng.standard_normal(self.size)
+        if self.state is None:
+            self.state = np.broadcast_to(np.asarray(mean, dtype=float), (self.size,)).copy()
+        else:
+            dt = max(t - self.last_t, 0.0)
+            self.state += self.theta * (mean - self.state) * dt
+            self.state += self.sigma * math.sqrt(dt) * noise
+            if self.low is not None or self.high is not None:
+                np.clip(self.state, self.low, self.high, out=self.state)
+        self.last_t = t
+        return self.state.copy()
+
+
+class RandomWalk:
+    """Random walk Gaussian yang dibatasi ke [low, high].
+
+    Tidak mean-reverting, jadi di mode multi-worker setiap worker bisa
+    berjalan ke arah berbeda; pakai OrnsteinUhlenbeck bila nilainya harus
+    sama di semua worker.
+    """
+
+    def __init__(self, start, sigma, low, high, size=1):
+        self.state = np.broadcast_to(np.asarray(start, dtype=float), (size,)).copy()
+        self.sigma = sigma
+        self.low = low
+        self.high = high
+        self.size = size
+        self.last_t = None
+
+    def __call__(self, t, rng):
+        noise = rng.standard_normal(self.size)
+        if self.last_t is not None:
+            dt = max(t - self.last_t, 0.0)
+            self.state += self.sigma * math.sqrt(dt) * noise
+            np.clip(self.state, self.low, self.high, out=self.state)
+        self.last_t = t
+        return self.state.copy()
+
+
+class MonotonicCounter:
+    """Counter yang selalu naik dengan laju `rate` per detik plus pola harian.
+
+    Nilainya fungsi tertutup dari waktu (integral laju), jadi tidak perlu
+    state dan semua worker selalu sama persis. `jitter` menambah variasi
+    kecil per tick tanpa pernah membuat counter turun. Bila `reset` di-set
+    (detik), counter kembali ke `start` setiap periode itu, misalnya
+    "penjualan hari ini"; tanpa `reset`, counter mulai naik dari `epoch`.
+    `interval` adalah jarak minimum antar tick (detik).
+    """
+
+    def __init__(self, rate, size=1, amplitude=0.0, start=0.0, jitter=0.5,
+                 peak_hour=14.0, period=DAY, reset=None, epoch=0.0, interval=1.0):
+        self.rate = np.broadcast_to(np.asarray(rate, dtype=float), (size,))
+        # Amplitudo relatif terhadap rate, dibatasi < 1 supaya laju tidak pernah negatif
+        self.amplitude = min(abs(amplitude), 0.95)
+        self.start = start
+        self.jitter = min(max(jitter, 0.0), 1.0)
+        self.peak = peak_hour * 3600.0
+        self.period = period
+        self.reset = reset
+        self.epoch = epoch
+        self.size = size
+        self.interval = interval
+        self.offset = -time.timezone
+
+    def integral(self, t):
+        """Integral laju dari awal periode reset (atau `epoch`) sampai t"""
+        local = t + self.offset
+        origin = local - local % self.reset if self.reset else self.epoch + self.offset
+        omega = 2 * math.pi / self.period
+        seasonal = (math.sin(omega * (local - self.peak)) - math.sin(omega * (origin - self.peak))) / omega
+        return self.rate * ((local - origin) + self.amplitude * seasonal)
+
+    def __call__(self, t, rng):
+        # Jitter < setengah kenaikan minimum per tick, jadi counter tetap monoton
+        minimum = self.rate * (1 - self.amplitude) * self.interval
+        noise = rng.random(self.size) * self.jitter * 0.5 * minimum
+        return np.floor(self.start + self.integral(t) + noise)
@@ -0,0 +1,63 @@
+"""Live update dashboard lewat Server-Sent Events.
+
+Satu snapshot dihitung per tick lalu dibagikan ke semua viewer yang
+terhubung; viewer hanya menerima nilai yang berubah sebagai delta JSON.
+"""
+
+import json
+import threading
+
+from flask import Response
+
+KEEPALIVE_SECONDS = 15
+
+
+def encode_event(data):
+    return f'data: {json.dumps(data, separators=(",", ":"))}\n\n'.encode('utf-8')
+
+
+class EventStream:
+    def __init__(self, app, ticker, snapshot, url='/events'):
+        self.snapshot = snapshot
+        self.condition = threading.Condition()
+        self.generation = 0
+        self.current = {}
+        self.full_event = b''
+        self.delta_event = None
+
+        ticker.listeners.append(self.publish)
+        app.add_url_rule(url, 'events', self.stream)
+
+    def publish(self):
+        """Dipanggil ticker: hitung snapshot & delta sekali untuk semua viewer"""
+        current = self.snapshot()
+        delta = {key: value for key, value in current.items() if self.current.get(key) != value}
+        with self.condition:
+            self.current = current
+            self.full_event = encode_event(current)
+            self.delta_event = encode_event(delta) if delta else None
+            self.generation += 1
+            self.condition.notify_all()
+
+    def events(self):
+        last = 0
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.generation != last, timeout=KEEPALIVE_SECONDS)
+                generation, full_event, delta_event = self.generation, self.full_event, self.delta_event
+
+            if generation == last:
+                yield b': keepalive\n\n'
+                continue
+
+            # Viewer yang tertinggal lebih dari satu tick dikirimi snapshot penuh
+            event = delta_event if last and generation == last + 1 else full_event
+            last = generation
+            if event:
+                yield event
+
+    def stream(self):
+        response = Response(self.events(), mimetype='text/event-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
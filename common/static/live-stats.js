@@ -0,0 +1,22 @@
+// Live update lewat Server-Sent Events: server hanya mengirim nilai yang berubah
+document.querySelectorAll('[data-stat]').forEach(el => {
+    el.lastValue = el.textContent.trim();
+});
+
+const events = new EventSource('/events');
+events.onmessage = (event) => {
+    const changes = JSON.parse(event.data);
+    Object.entries(changes).forEach(([key, value]) => {
+        document.querySelectorAll(`[data-stat="${key}"]`).forEach(el => {
+            if (el.lastValue === value) {
+                return;
+            }
+            el.lastValue = value;
+            clearInterval(el.counterTimer);
+            el.textContent = value;
+        });
+        document.querySelectorAll(`[data-stat-width="${key}"]`).forEach(el => {
+            el.style.width = value + '%';
+        });
+    });
+};
@@ -0,0 +1,117 @@
+"""Registry stasiun cuaca berbasis array NumPy untuk ribuan lokasi."""
+
+import os
+
+import numpy as np
+
+from common.collectors import ArrayCollector
+from common.feed import ActivityFeed, create_feed
+from common.signals import Diurnal, OrnsteinUhlenbeck, seeded_uniform
+
+# Kota yang tampil di dashboard; stasiun tambahan diberi nama station-00001 dst.
+CITIES = ['jakarta', 'bandung', 'surabaya', 'medan']
+
+# kuantitas: (nama metric, deskripsi, rentang nilai acak untuk update manual)
+QUANTITIES = {
+    'temperature': ('weather_temperature_celsius', 'Temperature in Celsius', (20.0, 35.0)),
+    'humidity': ('weather_humidity_percent', 'Humidity percentage', (40.0, 90.0)),
+    'pressure': ('weather_pressure_hpa', 'Atmospheric pressure in hPa', (1000.0, 1020.0)),
+    'wind_speed': ('weather_wind_speed_kmh', 'Wind speed in km/h', (0.0, 25.0)),
+    'rainfall': ('weather_rainfall_mm', 'Rainfall in mm', (0.0, 15.0)),
+    'air_quality': ('weather_air_quality_index', 'Air Quality Index', (50.0, 200.0)),
+}
+
+
+def station_signals(size):
+    """Generator per kuantitas untuk `size` stasiun; iklim dasar tiap stasiun tetap per nama"""
+    def base(quantity, low, high):
+        return seeded_uniform(f'station:{quantity}', low, high, size)
+
+    return {
+        'temperature': OrnsteinUhlenbeck(Diurnal(base('temperature', 24.0, 30.0), 4.0, size=size),
+                                         theta=0.05, sigma=0.1, size=size, low=15.0, high=40.0),
+        'humidity': OrnsteinUhlenbeck(Diurnal(base('humidity', 55.0, 75.0), -12.0, size=size),
+                                      theta=0.05, sigma=0.3, size=size, low=20.0, high=100.0),
+        'pressure': OrnsteinUhlenbeck(base('pressure', 1005.0, 1015.0),
+                                      theta=0.05, sigma=0.05, size=size, low=990.0, high=1030.0),
+        'wind_speed': OrnsteinUhlenbeck(base('wind_speed', 5.0, 15.0),
+                                        theta=0.05, sigma=0.5, size=size, low=0.0, high=40.0),
+        'rainfall': OrnsteinUhlenbeck(base('rainfall', 0.0, 6.0),
+                                      theta=0.05, sigma=0.3, size=size, low=0.0, high=25.0),
+        'air_quality': OrnsteinUhlenbeck(Diurnal(base('air_quality', 80.0, 150.0), 20.0, peak_hour=8.0, size=size),
+                                         theta=0.05, sigma=1.0, size=size, low=0.0, high=300.0),
+    }
+
+
+class StationRegistry(ArrayCollector):
+    """Nilai keenam kuantitas cuaca untuk semua stasiun, satu array per kuantitas.
+
+    Update per tick adalah satu operasi vektor per kuantitas, bukan loop
+    Python per lokasi, dan metric family diexport langsung dari array yang
+    sama (lihat ArrayCollector). Nilai mengikuti generator di
+    common/signals.py sehingga bergerak halus dari tick ke tick.
+
+    Lompatan manual (`request_update`) dicatat di feed `updates` untuk tick
+    tertentu, bukan langsung diterapkan, dan setiap worker menerapkannya di
+    `step()` tick tersebut dengan RNG yang di-seed dari id lompatan. Dengan
+    feed bersama (create_feed) state OU semua worker tetap sama.
+    """
+
+    def __init__(self, names, updates=None):
+        super().__init__(['location'], [(name,) for name in names])
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        for quantity, (name, documentation, _) in QUANTITIES.items():
+            self.add_family(quantity, name, documentation)
+        self.signals = station_signals(len(self.names))
+        self.updates = updates or ActivityFeed(capacity=16)
+        self.seen = 0  # id lompatan terakhir yang sudah diproses
+        self.started = False
+
+    @classmethod
+    def from_env(cls):
+        """CITIES ditambah stasiun sintetis sampai WEATHER_STATIONS lokasi"""
+        total = max(int(os.environ.get('WEATHER_STATIONS', len(CITIES))), len(CITIES))
+        extra = [f'station-{i:05d}' for i in range(1, total - len(CITIES) + 1)]
+        return cls(CITIES + extra, create_feed('weather-updates', capacity=16))
+
+    def step(self, t, generator):
+        """Majukan semua generator satu tick, lalu terapkan lompatan untuk tick ini"""
+        values = {quantity: signal(t, generator) for quantity, signal in self.signals.items()}
+        for entry in self._due_updates(t):
+            update = entry['message']
+            values = self._jump(np.random.default_rng([entry['id'], int(update['tick'])]), update['ranges'])
+        # Ganti semua array sekaligus supaya pembaca tidak melihat campuran dua tick
+        self.set_values(values)
+
+    def request_update(self, tick, ranges=None):
+        """Jadwalkan lompatan semua stasiun ke nilai acak di tick `tick`, kembalikan id-nya"""
+        return self.updates.add({'tick': tick, 'ranges': ranges or {}})
+
+    def _due_updates(self, t):
+        """Lompatan dengan tick <= t yang belum diproses, urut id"""
+        due = []
+        for entry in self.updates.since(self.seen, 100)['items']:
+            if entry['message']['tick'] > t:
+                break
+            self.seen = entry['id']
+            # Tick pertama proses ini (awal warmup): lompatan lama sudah memudar
+            if self.started:
+                due.append(entry)
+        self.started = True
+        return due
+
+    def _jump(self, generator, ranges):
+        """Nilai acak untuk semua stasiun; state OU ikut diganti lalu dibawa kembali perlahan"""
+        values = {}
+        for quantity, (_, _, default_range) in QUANTITIES.items():
+            low, high = ranges.get(quantity, default_range)
+            values[quantity] = generator.uniform(low, high, len(self.names))
+            if self.signals[quantity].state is not None:
+                self.signals[quantity].state = values[quantity].copy()
+        return values
+
+    def get(self, location):
+        i = self.index[location]
+        values = self.values
+        return {quantity: float(values[quantity][i]) for quantity in QUANTITIES}
@@ -0,0 +1,69 @@
+"""Generator data berbasis tick: state aplikasi di-update di background dengan interval tetap."""
+
+import logging
+import os
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Ticker:
+    """Memanggil `update(rng)` di thread background setiap `interval` detik.
+
+    Tick selaras dengan jam dinding dan RNG di-seed dari nomor tick, sehingga
+    semua worker gunicorn menghasilkan nilai yang sama untuk tick yang sama
+    tanpa perlu koordinasi. `generation` naik setiap kali state berubah, lalu
+    semua fungsi di `listeners` dipanggil.
+    """
+
+    def __init__(self, app, name, update, interval=None, warmup=0):
+        self.name = name
+        self.update = update
+        self.interval = interval or float(os.environ.get('TICK_INTERVAL', '1'))
+        # Tick lampau yang diputar ulang saat start, untuk generator yang punya state
+        self.warmup = warmup
+        self.now = None  # waktu tick yang sedang diproses (detik epoch)
+        self.generation = 0
+        self.listeners = []
+        self.lock = threading.Lock()
+        self.thread = None
+
+        # Thread dibuat saat request pertama, bukan saat import (aman setelah fork)
+        app.before_request(self.start)
+
+    def start(self):
+        if self.thread is not None:
+            return
+        with self.lock:
+            if self.thread is not None:
+                return
+            index = int(time.time() // self.interval)
+            for past in range(index - self.warmup, index):
+                self.advance(past)
+            self.tick()
+            self.thread = threading.Thread(target=self.run, name=f'{self.name}-ticker', daemon=True)
+            self.thread.start()
+
+    def upcoming(self, ticks=2):
+        """Waktu tick `ticks` interval ke depan; belum diproses worker mana pun"""
+        return (int(time.time() // self.interval) + ticks) * self.interval
+
+    def advance(self, index):
+        self.now = index * self.interval
+        self.update(random.Random(f'{self.name}:{index}'))
+
+    def tick(self):
+        self.advance(int(time.time() // self.interval))
+        self.generation += 1
+        for listener in self.listeners:
+            listener()
+
+    def run(self):
+        while True:
+            time.sleep(self.interval - time.time() % self.interval)
+            try:
+                self.tick()
+            except Exception:
+                logger.exception('tick %s gagal', self.name)
@@ -0,0 +1,96 @@
+"""Heavy hitters (top-K) dengan memori terbatas memakai algoritma Space-Saving."""
+
+from prometheus_client.core import GaugeMetricFamily
+
+
+class SpaceSaving:
+    """Sketch Space-Saving (Metwally dkk.) dengan struktur bucket per count.
+
+    Paling banyak `capacity` item yang dipantau, berapa pun jumlah item unik di
+    stream. Item dengan frekuensi di atas total/capacity dijamin masuk, dan
+    count setiap item paling banyak lebih tinggi `error`-nya dari nilai asli.
+
+    `add()` O(1): item dipindah dari bucket count lama ke bucket baru, dan
+    bila penuh item dari bucket minimum diganti. `refresh()` menyusun
+    snapshot top-K (dipanggil sekali per tick), jadi `top()` cukup membaca
+    snapshot tersebut.
+    """
+
+    def __init__(self, capacity=1000, k=10):
+        self.capacity = capacity
+        self.k = k
+        self.reset()
+
+    def reset(self):
+        self.counts = {}
+        self.errors = {}
+        self.buckets = {}  # count -> set item dengan count tersebut
+        self.min_count = 0
+        self.total = 0
+        self.snapshot = []
+
+    def _insert(self, item, count):
+        self.counts[item] = count
+        self.buckets.setdefault(count, set()).add(item)
+
+    def _remove(self, item, count):
+        bucket = self.buckets[count]
+        bucket.discard(item)
+        if not bucket:
+            del self.buckets[count]
+
+    def add(self, item, count=1):
+        self.total += count
+        current = self.counts.get(item)
+        if current is not None:
+            self._remove(item, current)
+            self._insert(item, current + count)
+        elif len(self.counts) < self.capacity:
+            self.errors[item] = 0
+            self.min_count = min(self.min_count, count) if self.counts else count
+            self._insert(item, count)
+        else:
+            # Ganti salah satu item dengan count terkecil; count barunya mewarisi
+            # count item lama sebagai batas atas error
+            if self.min_count not in self.buckets:
+                self.min_count = min(self.buckets)
+            victim = next(iter(self.buckets[self.min_count]))
+            self._remove(victim, self.min_count)
+            del self.counts[victim]
+            del self.errors[victim]
+            self.errors[item] = self.min_count
+            self._insert(item, self.min_count + count)
+
+    def refresh(self):
+        """Susun ulang snapshot top-K dari bucket dengan count tertinggi"""
+        snapshot = []
+        for count in sorted(self.buckets, reverse=True):
+            for item in sorted(self.buckets[count]):
+                snapshot.append((item, count, self.errors[item]))
+                if len(snapshot) == self.k:
+                    self.snapshot = snapshot
+                    return
+        self.snapshot = snapshot
+
+    def top(self, k=None):
+        """Top-k dari snapshot terakhir: list (item, count, error)"""
+        return self.snapshot[:k or self.k]
+
+
+class TopKCollector:
+    """Gauge per item, hanya untuk item di snapshot top-K (kardinalitas tetap <= k)"""
+
+    def __init__(self, sketch, name, documentation, label):
+        self.sketch = sketch
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+
+    def describe(self):
+        return [GaugeMetricFamily(self.name, self.documentation, labels=[self.label])]
+
+    def collect(self):
+        family = GaugeMetricFamily(self.name, self.documentation, labels=[self.label])
+        for item, count, _ in self.sketch.snapshot:
+            family.add_metric([item], count)
+        yield family
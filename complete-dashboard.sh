@@ -55,33 +55,15 @@ echo ""
 
 # Step 1: Generate comprehensive metrics
 print_header "Step 1: Generating Comprehensive Metrics Data"
-print_status "Generating E-Commerce metrics..."
-for i in {1..5}; do
-    curl -s http://localhost:8001/ > /dev/null 2>&1
-    curl -s http://localhost:8001/simulate-sales > /dev/null 2>&1
-    sleep 1
-done
-
-print_status "Generating Weather metrics..."
-for i in {1..5}; do
-    curl -s http://localhost:8002/ > /dev/null 2>&1
-    curl -s http://localhost:8002/update-weather > /dev/null 2>&1
-    sleep 1
-done
-
-print_status "Generating Social Media metrics..."
-for i in {1..5}; do
-    curl -s http://localhost:8003/ > /dev/null 2>&1
-    curl -s http://localhost:8003/generate-content > /dev/null 2>&1
-    sleep 1
-done
-
-print_status "Generating Sample App metrics..."
-for i in {1..3}; do
-    curl -s http://localhost:8000/ > /dev/null 2>&1
-    curl -s http://localhost:8000/simulate-load > /dev/null 2>&1
-    sleep 1
-done
+LOAD_RPS="${LOAD_RPS:-5}"
+LOAD_DURATION="${LOAD_DURATION:-20}"
+LOAD_REPORT="${LOAD_REPORT:-load-report.json}"
+print_status "Driving all 4 apps at ${LOAD_RPS} req/s each for ${LOAD_DURATION}s (open-loop)..."
+if python3 benchmarks/load_generator.py --rps "$LOAD_RPS" --duration "$LOAD_DURATION" --output "$LOAD_REPORT"; then
+    print_status "Latency percentiles saved to $LOAD_REPORT"
+else
+    print_warning "Load generator failed, metrics may be sparse"
+fi
 
 print_success "✅ Comprehensive metrics generated!"
 
@@ -158,19 +140,21 @@ QUERIES=(
     "weather_humidity_percent:Weather Humidity"
     "social_followers_count:Social Followers"
     "social_engagement_rate_percent:Social Engagement"
-    "rate(ecommerce_requests_total[5m]):E-Commerce Request Rate"
-    "rate(weather_requests_total[5m]):Weather Request Rate"
-    "rate(social_requests_total[5m]):Social Request Rate"
+    "job:requests:rate5m{job=\"ecommerce-app\"}:E-Commerce Request Rate"
+    "job:requests:rate5m{job=\"weather-app\"}:Weather Request Rate"
+    "job:requests:rate5m{job=\"social-app\"}:Social Request Rate"
+    "job_endpoint:request_duration_seconds:p95_5m:Request Latency p95"
 )
 
 WORKING_QUERIES=0
 TOTAL_QUERIES=${#QUERIES[@]}
 
 for query_info in "${QUERIES[@]}"; do
-    query=$(echo $query_info | cut -d: -f1)
-    name=$(echo $query_info | cut -d: -f2)
+    # Nama recording rule mengandung ':', jadi pisahkan di ':' terakhir
+    query="${query_info%:*}"
+    name="${query_info##*:}"
     
-    RESULT=$(curl -s "http://localhost:9090/api/v1/query?query=$query" 2>/dev/null)
+    RESULT=$(curl -s -G "http://localhost:9090/api/v1/query" --data-urlencode "query=$query" 2>/dev/null)
     if echo "$RESULT" | grep -q '"status":"success"' && echo "$RESULT" | grep -q '"result":\['; then
         if echo "$RESULT" | grep -q '"value":\['; then
             print_success "  ✅ $name: Has data"
@@ -186,6 +170,14 @@ done
 echo ""
 print_highlight "📊 Query Success Rate: $WORKING_QUERIES/$TOTAL_QUERIES queries working"
 
+# Biaya query dashboard: pola mahal + jumlah series per panel (grafana/promql_lint.py)
+print_status "Linting dashboard queries against live series counts..."
+if python3 grafana/promql_lint.py "$COMPLETE_DASHBOARD" --prometheus "http://localhost:9090"; then
+    print_success "✅ Dashboard queries are cheap enough"
+else
+    print_warning "⚠️ Some dashboard queries are expensive, see lint output above"
+fi
+
 # Step 6: Setup/verify data source
 print_header "Step 6: Configuring Prometheus Data Source"
 DS_RESPONSE=$(curl -s -u "$GRAFANA_USER:$GRAFANA_PASS" "$GRAFANA_URL/api/datasources" 2>/dev/null)
@@ -316,6 +308,8 @@ echo "   📱 Social Media Analytics (Followers, Engagement)"
 echo "   ⚡ Response Times (95th Percentile)"
 echo "   🌐 Network I/O Monitoring"
 echo "   📈 Business KPIs Overview"
+echo "   ⚖️ Throughput per Replica & Proxy Latency"
+echo "   📋 Sample App (Users, CPU, Memory)"
 echo ""
 
 print_highlight "🌐 Access Your Complete Dashboard:"
@@ -3,21 +3,42 @@
 import time
 import random
 import json
-from flask import Flask, Response, render_template_string
-from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
+from flask import Flask, jsonify, request
+from prometheus_client import Counter, Gauge
+
+from common.api import conditional_json
+from common.assets import StaticAssets
+from common.feed import create_feed
+from common.instrumentation import RequestMetrics
+from common.jobs import JobQueue
+from common.metrics import ExpositionCache
+from common.orders import STATUSES, OrderStore, WindowMetrics, parse_orders
+from common.sessions import SessionTracker
+from common.sharedlog import shared_path
+from common.signals import DAY, WARMUP_TICKS, MonotonicCounter, numpy_rng
+from common.sse import EventStream
+from common.ticker import Ticker
 
 # Inisialisasi Flask app
 app = Flask(__name__)
 
+# Jumlah request dan latency per endpoint/method/status untuk semua route
+request_metrics = RequestMetrics(app, 'ecommerce')
+
+# CSS/JS dashboard dilayani sebagai asset ber-hash dengan cache immutable
+assets = StaticAssets(app)
+
 # Prometheus metrics untuk E-commerce
-REQUEST_COUNT = Counter('ecommerce_requests_total', 'Total number of requests', ['method', 'endpoint'])
-REQUEST_LATENCY = Histogram('ecommerce_request_duration_seconds', 'Request latency')
-ACTIVE_USERS = Gauge('ecommerce_active_users', 'Number of active users')
-TOTAL_SALES = Gauge('ecommerce_total_sales_usd', 'Total sales in USD')
+# Active users dihitung dari sketch gabungan semua worker, nilainya sama di setiap worker
+ACTIVE_USERS = Gauge('ecommerce_active_users', 'Number of active users', multiprocess_mode='livemax')
+# Revenue 1 jam dijumlahkan antar worker (setiap worker punya order store sendiri)
+TOTAL_SALES = Gauge('ecommerce_total_sales_usd', 'Sales in USD over the last hour', multiprocess_mode='livesum')
+REVENUE = Counter('ecommerce_revenue_usd', 'Revenue from completed orders in USD')
 ORDERS_COUNT = Counter('ecommerce_orders_total', 'Total number of orders', ['status'])
 PRODUCT_VIEWS = Counter('ecommerce_product_views_total', 'Total product views', ['category'])
-CART_ITEMS = Gauge('ecommerce_cart_items_average', 'Average items in cart')
-CONVERSION_RATE = Gauge('ecommerce_conversion_rate_percent', 'Conversion rate percentage')
+
+# Active users dan pengunjung unik dari request asli (cookie / X-Client-Id)
+sessions = SessionTracker(app, 'ecommerce', ACTIVE_USERS)
 
 # HTML template dengan animasi CSS
 HTML_TEMPLATE = '''
@@ -27,192 +48,7 @@ HTML_TEMPLATE = '''
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>🛒 E-Commerce Dashboard</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Arial', sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            color: white;
-        }
-        
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-        }
-        
-        .header {
-            text-align: center;
-            margin-bottom: 40px;
-            animation: fadeInDown 1s ease-out;
-        }
-        
-        .header h1 {
-            font-size: 3rem;
-            margin-bottom: 10px;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }
-        
-        .stats-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 20px;
-            margin-bottom: 40px;
-        }
-        
-        .stat-card {
-            background: rgba(255, 255, 255, 0.1);
-            backdrop-filter: blur(10px);
-            border-radius: 15px;
-            padding: 25px;
-            text-align: center;
-            border: 1px solid rgba(255, 255, 255, 0.2);
-            animation: slideInUp 0.8s ease-out;
-            transition: transform 0.3s ease, box-shadow 0.3s ease;
-        }
-        
-        .stat-card:hover {
-            transform: translateY(-5px);
-            box-shadow: 0 10px 25px rgba(0,0,0,0.2);
-        }
-        
-        .stat-icon {
-            font-size: 2.5rem;
-            margin-bottom: 15px;
-            animation: bounce 2s infinite;
-        }
-        
-        .stat-value {
-            font-size: 2rem;
-            font-weight: bold;
-            margin-bottom: 5px;
-            animation: countUp 2s ease-out;
-        }
-        
-        .stat-label {
-            font-size: 0.9rem;
-            opacity: 0.8;
-        }
-        
-        .actions {
-            display: flex;
-            justify-content: center;
-            gap: 20px;
-            flex-wrap: wrap;
-            margin-bottom: 40px;
-        }
-        
-        .btn {
-            background: linear-gradient(45deg, #ff6b6b, #ee5a24);
-            color: white;
-            padding: 15px 30px;
-            border: none;
-            border-radius: 25px;
-            font-size: 1rem;
-            cursor: pointer;
-            text-decoration: none;
-            display: inline-block;
-            transition: all 0.3s ease;
-            animation: pulse 2s infinite;
-        }
-        
-        .btn:hover {
-            transform: scale(1.05);
-            box-shadow: 0 5px 15px rgba(0,0,0,0.3);
-        }
-        
-        .activity-feed {
-            background: rgba(255, 255, 255, 0.1);
-            backdrop-filter: blur(10px);
-            border-radius: 15px;
-            padding: 25px;
-            border: 1px solid rgba(255, 255, 255, 0.2);
-        }
-        
-        .activity-item {
-            padding: 10px 0;
-            border-bottom: 1px solid rgba(255, 255, 255, 0.1);
-            animation: slideInLeft 0.5s ease-out;
-        }
-        
-        .activity-item:last-child {
-            border-bottom: none;
-        }
-        
-        @keyframes fadeInDown {
-            from {
-                opacity: 0;
-                transform: translateY(-30px);
-            }
-            to {
-                opacity: 1;
-                transform: translateY(0);
-            }
-        }
-        
-        @keyframes slideInUp {
-            from {
-                opacity: 0;
-                transform: translateY(30px);
-            }
-            to {
-                opacity: 1;
-                transform: translateY(0);
-            }
-        }
-        
-        @keyframes slideInLeft {
-            from {
-                opacity: 0;
-                transform: translateX(-30px);
-            }
-            to {
-                opacity: 1;
-                transform: translateX(0);
-            }
-        }
-        
-        @keyframes bounce {
-            0%, 20%, 50%, 80%, 100% {
-                transform: translateY(0);
-            }
-            40% {
-                transform: translateY(-10px);
-            }
-            60% {
-                transform: translateY(-5px);
-            }
-        }
-        
-        @keyframes pulse {
-            0% {
-                box-shadow: 0 0 0 0 rgba(255, 107, 107, 0.7);
-            }
-            70% {
-                box-shadow: 0 0 0 10px rgba(255, 107, 107, 0);
-            }
-            100% {
-                box-shadow: 0 0 0 0 rgba(255, 107, 107, 0);
-            }
-        }
-        
-        @keyframes countUp {
-            from {
-                opacity: 0;
-                transform: scale(0.5);
-            }
-            to {
-                opacity: 1;
-                transform: scale(1);
-            }
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('dashboard.css') }}">
 </head>
 <body>
     <div class="container">
@@ -224,37 +60,37 @@ HTML_TEMPLATE = '''
         <div class="stats-grid">
             <div class="stat-card">
                 <div class="stat-icon">👥</div>
-                <div class="stat-value">{{ active_users }}</div>
+                <div class="stat-value" data-stat="active_users">{{ stats.active_users }}</div>
                 <div class="stat-label">Active Users</div>
             </div>
             
             <div class="stat-card">
                 <div class="stat-icon">💰</div>
-                <div class="stat-value">${{ "%.2f"|format(total_sales) }}</div>
-                <div class="stat-label">Total Sales</div>
+                <div class="stat-value" data-stat="total_sales">{{ stats.total_sales }}</div>
+                <div class="stat-label">Sales (1h)</div>
             </div>
             
             <div class="stat-card">
                 <div class="stat-icon">📦</div>
-                <div class="stat-value">{{ total_orders }}</div>
-                <div class="stat-label">Total Orders</div>
+                <div class="stat-value" data-stat="total_orders">{{ stats.total_orders }}</div>
+                <div class="stat-label">Orders (1h)</div>
             </div>
             
             <div class="stat-card">
                 <div class="stat-icon">🛍️</div>
-                <div class="stat-value">{{ "%.1f"|format(cart_items) }}</div>
-                <div class="stat-label">Avg Cart Items</div>
+                <div class="stat-value" data-stat="cart_items">{{ stats.cart_items }}</div>
+                <div class="stat-label">Avg Cart Items (5m)</div>
             </div>
             
             <div class="stat-card">
                 <div class="stat-icon">📈</div>
-                <div class="stat-value">{{ "%.1f"|format(conversion_rate) }}%</div>
-                <div class="stat-label">Conversion Rate</div>
+                <div class="stat-value" data-stat="conversion_rate">{{ stats.conversion_rate }}</div>
+                <div class="stat-label">Conversion (5m)</div>
             </div>
             
             <div class="stat-card">
                 <div class="stat-icon">👀</div>
-                <div class="stat-value">{{ product_views }}</div>
+                <div class="stat-value" data-stat="product_views">{{ stats.product_views }}</div>
                 <div class="stat-label">Product Views</div>
             </div>
         </div>
@@ -275,124 +111,183 @@ HTML_TEMPLATE = '''
         </div>
     </div>
     
-    <script>
-        // Auto refresh setiap 5 detik
-        setTimeout(() => {
-            location.reload();
-        }, 5000);
-        
-        // Animasi counter
-        document.querySelectorAll('.stat-value').forEach(el => {
-            const finalValue = parseFloat(el.textContent.replace(/[^0-9.-]/g, ''));
-            if (!isNaN(finalValue)) {
-                let currentValue = 0;
-                const increment = finalValue / 50;
-                const timer = setInterval(() => {
-                    currentValue += increment;
-                    if (currentValue >= finalValue) {
-                        currentValue = finalValue;
-                        clearInterval(timer);
-                    }
-                    if (el.textContent.includes('$')) {
-                        el.textContent = '$' + currentValue.toFixed(2);
-                    } else if (el.textContent.includes('%')) {
-                        el.textContent = currentValue.toFixed(1) + '%';
-                    } else {
-                        el.textContent = Math.round(currentValue);
-                    }
-                }, 50);
-            }
-        });
-    </script>
+    <script src="{{ asset_url('dashboard.js') }}"></script>
+    <script src="{{ asset_url('live-stats.js') }}"></script>
 </body>
 </html>
 '''
 
-# Data untuk simulasi
-recent_activities = []
+# Template dikompilasi sekali saat startup lalu dipakai ulang di setiap request
+HOME_TEMPLATE = app.jinja_env.from_string(HTML_TEMPLATE)
+
+# Feed aktivitas berkapasitas ACTIVITY_FEED_SIZE (default 5000); dibagi
+# semua worker lewat SHARED_STATE_DIR, ring buffer per proses bila tidak di-set
+activity_feed = create_feed('activity')
 
 def add_activity(message):
-    global recent_activities
-    current_time = time.strftime("%H:%M:%S")
-    recent_activities.insert(0, {"time": current_time, "message": message})
-    recent_activities = recent_activities[:10]  # Keep only last 10 activities
+    activity_feed.add(message)
+
+# Order dari POST /api/orders dan /simulate-sales disimpan di order store
+# (log bersama antar worker bila SHARED_STATE_DIR di-set); revenue, order per
+# status, dan isi keranjang dijumlahkan di sliding window 1m/5m/1h yang
+# di-update inkremental, lalu digabung antar worker lewat gauge livesum
+# ecommerce_window_* (common/orders.py)
+orders = OrderStore(path=shared_path('orders'))
+window_metrics = WindowMetrics(orders, 'ecommerce')
+
+def record_orders(batch):
+    """Simpan satu batch order, counter Prometheus di-increment sekali per status"""
+    first, last = orders.add_batch(batch)
+    window_metrics.publish()
+    per_status = dict.fromkeys(STATUSES, 0)
+    revenue_cents = 0
+    for amount, _, status in batch:
+        per_status[status] += 1
+        if status == 'completed':
+            revenue_cents += amount
+    for status, count in per_status.items():
+        if count:
+            ORDERS_COUNT.labels(status=status).inc(count)
+    if revenue_cents:
+        REVENUE.inc(revenue_cents / 100)
+    return first, last
+
+# Sinyal berkorelasi waktu (common/signals.py): product views adalah total
+# "hari ini" yang terus naik
+SIGNALS = {
+    'product_views': MonotonicCounter(rate=3000 / DAY, amplitude=0.6, reset=DAY),
+}
+
+# State dashboard, di-update oleh ticker dengan interval tetap (bukan oleh request)
+state = {}
+
+def update_state(rng):
+    global state
+    generator, now = numpy_rng(rng), ticker.now
+    values = {key: float(signal(now, generator)[0]) for key, signal in SIGNALS.items()}
+    # Jumlah window worker ini dipublikasikan dulu, lalu KPI dibaca dari gabungan semua worker
+    window_metrics.publish(now)
+    kpis = window_metrics.kpis()
+    hour, recent = kpis['1h'], kpis['5m']
+    state = {
+        'active_users': sessions.refresh(),
+        'total_sales': hour['revenue'],
+        'total_orders': hour['orders']['completed'],
+        'cart_items': recent['basket_size'],
+        'conversion_rate': recent['conversion_rate'],
+        'product_views': int(values['product_views']),
+    }
+    
+    # Update metrics
+    TOTAL_SALES.set(orders.kpis('1h', now)['revenue'])
+
+def display_stats():
+    """Nilai kartu dashboard dalam format tampilan, dipakai template dan stream /events"""
+    return {
+        'active_users': str(state['active_users']),
+        'total_sales': f"${state['total_sales']:.2f}",
+        'total_orders': str(state['total_orders']),
+        'cart_items': f"{state['cart_items']:.1f}",
+        'conversion_rate': f"{state['conversion_rate']:.1f}%",
+        'product_views': str(state['product_views']),
+    }
+
+ticker = Ticker(app, 'ecommerce', update_state, warmup=WARMUP_TICKS)
+exposition = ExpositionCache(ticker)
+# Satu snapshot per tick dibagikan ke semua viewer lewat Server-Sent Events
+events = EventStream(app, ticker, display_stats)
 
 @app.route('/')
 def home():
-    REQUEST_COUNT.labels(method='GET', endpoint='/').inc()
-    with REQUEST_LATENCY.time():
-        # Simulasi data real-time
-        active_users = random.randint(50, 200)
-        total_sales = random.uniform(10000, 50000)
-        total_orders = random.randint(100, 500)
-        cart_items = random.uniform(2.0, 8.0)
-        conversion_rate = random.uniform(2.0, 8.0)
-        product_views = random.randint(1000, 5000)
-        
-        # Update metrics
-        ACTIVE_USERS.set(active_users)
-        TOTAL_SALES.set(total_sales)
-        CART_ITEMS.set(cart_items)
-        CONVERSION_RATE.set(conversion_rate)
-        
-        return render_template_string(HTML_TEMPLATE,
-                                    active_users=active_users,
-                                    total_sales=total_sales,
-                                    total_orders=total_orders,
-                                    cart_items=cart_items,
-                                    conversion_rate=conversion_rate,
-                                    product_views=product_views,
-                                    recent_activities=recent_activities)
+    # Halaman hanya menampilkan 10 entry terbaru, buffer tidak disalin utuh
+    return HOME_TEMPLATE.render(stats=display_stats(), recent_activities=activity_feed.latest(10))
 
 @app.route('/health')
 def health():
-    REQUEST_COUNT.labels(method='GET', endpoint='/health').inc()
-    add_activity("Health check performed")
     return {'status': 'healthy', 'timestamp': time.time(), 'service': 'ecommerce-dashboard'}
 
+@app.route('/api/stats')
+def api_stats():
+    # Nilai kartu dashboard sebagai JSON; poller cukup kirim If-None-Match
+    # dan dapat 304 selama tick belum berganti
+    return conditional_json({'stats': state})
+
+@app.route('/api/kpis')
+def api_kpis():
+    # KPI semua window dibaca dari jumlah berjalan semua worker, O(1) berapa pun jumlah order
+    return jsonify(window_metrics.kpis())
+
+@app.route('/api/orders', methods=['POST'])
+def ingest_orders():
+    # Satu order (JSON), array JSON, atau NDJSON: {"amount": 129.9, "items": 3, "status": "completed"}
+    try:
+        batch = parse_orders(request.get_data(cache=False))
+    except ValueError as exc:
+        return jsonify({'error': str(exc)}), 400
+    if not batch:
+        return jsonify({'error': 'no orders in request'}), 400
+    first, last = record_orders(batch)
+    return jsonify({'accepted': len(batch), 'first_id': first, 'last_id': last}), 201
+
+@app.route('/api/orders')
+def recent_orders():
+    limit = max(1, min(request.args.get('limit', 20, type=int), 1000))
+    return jsonify({'orders': orders.recent(limit)})
+
+@app.route('/api/activity')
+def api_activity():
+    # Paging dengan cursor: kirim next_since dari response sebelumnya sebagai ?since=
+    since = request.args.get('since', 0, type=int)
+    limit = max(1, min(request.args.get('limit', 100, type=int), 1000))
+    return conditional_json(activity_feed.since(since, limit))
+
+def run_sales_simulation():
+    # Simulasi penjualan: order acak lewat pipeline yang sama dengan POST /api/orders
+    batch = [(random.randint(1000, 15000), random.randint(1, 8),
+              random.choices(STATUSES, weights=(60, 10, 5, 25))[0])
+             for _ in range(random.randint(5, 20))]
+    record_orders(batch)
+    sales_amount = sum(amount for amount, _, status in batch if status == 'completed') / 100
+    completed = sum(1 for _, _, status in batch if status == 'completed')
+    
+    # Update metrics
+    PRODUCT_VIEWS.labels(category='electronics').inc(random.randint(10, 50))
+    PRODUCT_VIEWS.labels(category='clothing').inc(random.randint(5, 30))
+    PRODUCT_VIEWS.labels(category='books').inc(random.randint(3, 15))
+    
+    add_activity(f"Generated ${sales_amount:.2f} in sales with {completed} orders")
+    
+    time.sleep(random.uniform(0.5, 1.5))
+    return f'✅ Sales simulation completed! Generated ${sales_amount:.2f} with {completed} orders'
+
 @app.route('/simulate-sales')
 def simulate_sales():
-    REQUEST_COUNT.labels(method='GET', endpoint='/simulate-sales').inc()
-    with REQUEST_LATENCY.time():
-        # Simulasi penjualan
-        sales_amount = random.uniform(100, 1000)
-        orders = random.randint(5, 20)
-        
-        # Update metrics
-        ORDERS_COUNT.labels(status='completed').inc(orders)
-        PRODUCT_VIEWS.labels(category='electronics').inc(random.randint(10, 50))
-        PRODUCT_VIEWS.labels(category='clothing').inc(random.randint(5, 30))
-        PRODUCT_VIEWS.labels(category='books').inc(random.randint(3, 15))
-        
-        add_activity(f"Generated ${sales_amount:.2f} in sales with {orders} orders")
-        
-        time.sleep(random.uniform(0.5, 1.5))
-        return f'✅ Sales simulation completed! Generated ${sales_amount:.2f} with {orders} orders'
+    return run_sales_simulation()
+
+def run_load_simulation():
+    # Simulasi beban kerja
+    duration = random.uniform(0.5, 2.0)
+    time.sleep(duration)
+    
+    add_activity(f"Load simulation completed in {duration:.2f} seconds")
+    
+    return f'Load simulation completed in {duration:.2f} seconds'
 
 @app.route('/simulate-load')
 def simulate_load():
-    REQUEST_COUNT.labels(method='GET', endpoint='/simulate-load').inc()
-    with REQUEST_LATENCY.time():
-        # Simulasi beban kerja
-        duration = random.uniform(0.5, 2.0)
-        time.sleep(duration)
-        
-        # Update metrics
-        ACTIVE_USERS.set(random.randint(10, 100))
-        
-        add_activity(f"Load simulation completed in {duration:.2f} seconds")
-        
-        return f'Load simulation completed in {duration:.2f} seconds'
+    return run_load_simulation()
+
+# Job API: POST /jobs/<nama> lalu cek status di GET /jobs/<id>
+jobs = JobQueue(app, 'ecommerce', {
+    'simulate-sales': run_sales_simulation,
+    'simulate-load': run_load_simulation,
+})
 
 @app.route('/metrics')
 def metrics():
-    # Update metrics sebelum serving
-    ACTIVE_USERS.set(random.randint(30, 150))
-    TOTAL_SALES.set(random.uniform(5000, 30000))
-    CART_ITEMS.set(random.uniform(1.5, 6.0))
-    CONVERSION_RATE.set(random.uniform(1.5, 7.0))
-    
-    return Response(generate_latest(), mimetype=CONTENT_TYPE_LATEST)
+    # Exposition di-cache per tick; format (text/OpenMetrics/protobuf) dan
+    # kompresi (gzip/zstd) dinegosiasikan dari header Accept & Accept-Encoding
+    return exposition.response()
 
 if __name__ == '__main__':
     print("🛒 Starting E-Commerce Dashboard...")
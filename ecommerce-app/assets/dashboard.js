@@ -0,0 +1,22 @@
+// Animasi counter
+document.querySelectorAll('.stat-value').forEach(el => {
+    const finalValue = parseFloat(el.textContent.replace(/[^0-9.-]/g, ''));
+    if (!isNaN(finalValue)) {
+        let currentValue = 0;
+        const increment = finalValue / 50;
+        const timer = el.counterTimer = setInterval(() => {
+            currentValue += increment;
+            if (currentValue >= finalValue) {
+                currentValue = finalValue;
+                clearInterval(timer);
+            }
+            if (el.textContent.includes('$')) {
+                el.textContent = '$' + currentValue.toFixed(2);
+            } else if (el.textContent.includes('%')) {
+                el.textContent = currentValue.toFixed(1) + '%';
+            } else {
+                el.textContent = Math.round(currentValue);
+            }
+        }, 50);
+    }
+});
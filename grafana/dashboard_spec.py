@@ -0,0 +1,205 @@
+"""Spesifikasi deklaratif complete-dashboard.json.
+
+Setiap panel cukup menyebut judul, tipe, lebar, unit, dan query (expr,
+legend). Layout (gridPos), id, refId, dan fieldConfig/options Grafana
+dibuat oleh generate_dashboard.py, jadi panel baru tidak perlu menyalin
+ratusan baris JSON. Setelah mengubah file ini jalankan:
+    python grafana/generate_dashboard.py
+
+Query aplikasi selalu memakai matcher `job` dan diagregasi `by (job)`
+supaya tetap murah berapa pun jumlah replica / series (lihat promql_lint.py).
+"""
+
+# Job Prometheus (nama service compose) -> nama tampilan
+APPS = {
+    'ecommerce-app': '🛒 E-Commerce',
+    'weather-app': '🌤️ Weather',
+    'social-app': '📱 Social Media',
+    'sample-app': '📋 Sample App',
+}
+
+LINKS = [
+    ('🛒 E-Commerce App', 'Open E-Commerce Application', 'http://localhost:8001'),
+    ('🌤️ Weather App', 'Open Weather Application', 'http://localhost:8002'),
+    ('📱 Social Media App', 'Open Social Media Application', 'http://localhost:8003'),
+    ('📊 Prometheus', 'Open Prometheus Interface', 'http://localhost:9090'),
+]
+
+DASHBOARD = {
+    'uid': 'docker-monitoring-complete',
+    'title': '🚀 Docker Monitoring - Complete Dashboard',
+    'tags': ['docker', 'monitoring', 'prometheus', 'complete'],
+    'time_from': 'now-15m',
+    'refresh': '5s',
+    'message': 'Complete Docker monitoring dashboard with all applications',
+}
+
+# Panel disusun kiri ke kanan dalam grid 24 kolom; pindah baris bila penuh.
+# Key opsional lihat PANEL_DEFAULTS di generate_dashboard.py.
+PANELS = [
+    {
+        'title': '🔥 Service Health Status',
+        'type': 'stat',
+        'width': 12,
+        'graph_mode': 'none',
+        'color_mode': 'background',
+        'mappings': {0: ('🔴 DOWN', 'red'), 1: ('🟢 UP', 'green')},
+        'thresholds': [(None, 'red'), (1, 'green')],
+        # Semua job memang ingin ditampilkan, jadi `up` tanpa matcher
+        'lint_ignore': ['no-matchers'],
+        # Satu series per job; min: job dianggap DOWN begitu satu replica down,
+        # jadi mapping 0/1 tetap berlaku berapa pun jumlah replica
+        'queries': [('min by (job) (up)', '{{job}}')],
+    },
+    {
+        'title': '💻 System Resources',
+        'type': 'stat',
+        'width': 12,
+        'unit': 'percent',
+        'thresholds': [(None, 'green'), (70, 'yellow'), (85, 'red')],
+        'queries': [
+            ('job:node_cpu_utilisation:percent', 'CPU Usage (%)'),
+            ('job:node_memory_utilisation:percent', 'Memory Usage (%)'),
+        ],
+    },
+    {
+        'title': '📊 Application Request Rates',
+        'type': 'timeseries',
+        'width': 24,
+        'unit': 'reqps',
+        'min': 0,
+        'queries': [(f'job:requests:rate5m{{job="{job}"}}', name) for job, name in APPS.items()],
+    },
+    {
+        'title': '🛒 E-Commerce Metrics',
+        'type': 'stat',
+        'width': 8,
+        'orientation': 'vertical',
+        'color': 'continuous-GrYlRd',
+        'overrides': {'.*Sales.*': 'currencyUSD', '.*Order Value.*': 'currencyUSD', '.*Rate.*': 'percent'},
+        # Rasio direkam dari jumlah window semua worker/replica (recording.yml),
+        # bukan dari gauge rasio milik satu worker
+        'queries': [
+            ('sum by (job) (ecommerce_active_users{job="ecommerce-app"})', '👥 Active Users'),
+            ('sum by (job) (ecommerce_total_sales_usd{job="ecommerce-app"})', '💰 Sales (1h)'),
+            ('job_window:ecommerce_conversion:percent{window="5m"}', '📈 Conversion Rate'),
+            ('job_window:ecommerce_basket_size:avg{window="5m"}', '🛍️ Avg Cart Items'),
+            ('job_window:ecommerce_order_value_usd:avg{window="1h"}', '💵 Avg Order Value'),
+        ],
+    },
+    {
+        'title': '🌤️ Weather Monitoring',
+        'type': 'timeseries',
+        'width': 8,
+        'fill': 15,
+        'point_size': 4,
+        'legend_calcs': ['lastNotNull'],
+        'legend_mode': 'list',
+        'tooltip_sort': 'none',
+        'overrides': {'.*Temperature.*': 'celsius', '.*Humidity.*': 'percent'},
+        # Hanya kota dashboard; station-NNNNN sintetis bisa ribuan series
+        'queries': [
+            ('avg by (job, location) (weather_temperature_celsius{job="weather-app", location!~"station-.*"})',
+             '🌡️ Temperature (°C)'),
+            ('avg by (job, location) (weather_humidity_percent{job="weather-app", location!~"station-.*"})',
+             '💧 Humidity (%)'),
+            ('avg by (job, location) (weather_air_quality_index{job="weather-app", location!~"station-.*"})',
+             '🏭 Air Quality Index'),
+        ],
+    },
+    {
+        'title': '📱 Social Media Analytics',
+        'type': 'stat',
+        'width': 8,
+        'orientation': 'vertical',
+        'color': 'continuous-BlPu',
+        'overrides': {'.*Engagement.*': 'percent'},
+        'queries': [
+            # Followers sama di setiap replica (generator deterministik): max per platform dulu
+            ('sum by (job) (max by (job, platform) (social_followers_count{job="social-app"}))', '👥 Total Followers'),
+            ('avg by (job) (social_engagement_rate_percent{job="social-app"})', '📊 Avg Engagement'),
+            ('sum by (job) (social_active_users_count{job="social-app"})', '🔥 Active Users'),
+        ],
+    },
+    {
+        'title': '⚡ Response Times (95th Percentile)',
+        'type': 'timeseries',
+        'width': 12,
+        'unit': 's',
+        'min': 0,
+        'fill': 10,
+        'gradient': 'none',
+        'line': 'linear',
+        'thresholds': [(None, 'green'), (1, 'yellow'), (2, 'red')],
+        'threshold_style': 'line',
+        'queries': [(f'job_endpoint:request_duration_seconds:p95_5m{{job="{job}"}}', f'{name} {{{{endpoint}}}}')
+                    for job, name in APPS.items()],
+    },
+    {
+        'title': '🌐 Network I/O',
+        'type': 'timeseries',
+        'width': 12,
+        'unit': 'Bps',
+        'min': 0,
+        'legend_mode': 'list',
+        'queries': [
+            ('instance_device:node_network_receive_bytes:rate5m', '📥 Received'),
+            ('instance_device:node_network_transmit_bytes:rate5m', '📤 Transmitted'),
+        ],
+    },
+    {
+        'title': '📈 Business KPIs Overview',
+        'type': 'stat',
+        'width': 24,
+        'height': 6,
+        'unit': 'short',
+        'min': 0,
+        'color': 'continuous-GrYlRd',
+        'queries': [
+            ('job:ecommerce_orders:rate1m * 60', '🛒 Orders/min'),
+            ('job:ecommerce_product_views:rate1m * 60', '👀 Views/min'),
+            ('job:social_likes:rate1m * 60', '❤️ Likes/min'),
+            ('job:social_shares:rate1m * 60', '🔄 Shares/min'),
+        ],
+    },
+    {
+        'title': '⚖️ Throughput per Replica',
+        'type': 'timeseries',
+        'width': 12,
+        'unit': 'reqps',
+        'min': 0,
+        'fill': 10,
+        'gradient': 'none',
+        'line': 'linear',
+        'queries': [('job:requests:rate5m / job:replicas:count', '{{job}} req/s per replica')],
+    },
+    {
+        'title': '🔀 Proxy Latency (HAProxy)',
+        'type': 'timeseries',
+        'width': 12,
+        'unit': 's',
+        'min': 0,
+        'fill': 10,
+        'gradient': 'none',
+        'line': 'linear',
+        'thresholds': [(None, 'green'), (1, 'yellow'), (2, 'red')],
+        'threshold_style': 'line',
+        'queries': [
+            ('max by (proxy) (haproxy_backend_total_time_average_seconds{job="proxy"})', '{{proxy}} total'),
+            ('max by (proxy) (haproxy_backend_queue_time_average_seconds{job="proxy"})', '{{proxy}} queue'),
+        ],
+    },
+    {
+        'title': '📋 Sample App',
+        'type': 'stat',
+        'width': 24,
+        'height': 6,
+        'color': 'continuous-GrYlRd',
+        'overrides': {'.*CPU.*': 'percent', '.*Memory.*': 'bytes'},
+        'queries': [
+            ('sum by (job) (sample_app_active_users{job="sample-app"})', '👥 Active Users'),
+            ('avg by (job) (sample_app_cpu_usage_percent{job="sample-app"})', '💻 CPU Usage'),
+            ('avg by (job) (sample_app_memory_usage_bytes{job="sample-app"})', '🧠 Memory Usage'),
+        ],
+    },
+]
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""Generate complete-dashboard.json dari grafana/dashboard_spec.py.
+
+Semua query dicek dulu oleh promql_lint.py; file tidak ditulis bila ada
+error (histogram_quantile tanpa agregasi, window rate terlalu pendek, ...).
+
+Jalankan dari root project:
+    python grafana/generate_dashboard.py
+    python grafana/generate_dashboard.py --check   # gagal bila JSON tidak sama dengan spec
+"""
+
+import argparse
+import json
+import os
+import string
+import sys
+
+from dashboard_spec import DASHBOARD, LINKS, PANELS
+from promql_lint import SCRAPE_INTERVAL, lint_query
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT = os.path.join(ROOT, 'complete-dashboard.json')
+GRID_WIDTH = 24
+DATASOURCE = {'type': 'prometheus', 'uid': 'prometheus'}
+
+# Nilai default key opsional panel di dashboard_spec.PANELS
+PANEL_DEFAULTS = {
+    'width': 12,
+    'height': 8,
+    'unit': None,
+    'min': None,
+    'color': None,              # mode warna; default thresholds (stat) / palette-classic (timeseries)
+    'thresholds': None,         # list (nilai, warna), nilai pertama None
+    'overrides': {},            # regex nama series -> unit
+    'lint_ignore': [],          # aturan promql_lint yang dilewati untuk semua query panel
+    # stat
+    'orientation': 'horizontal',
+    'color_mode': 'value',
+    'graph_mode': 'area',       # 'none': cukup instant query, tanpa range data
+    'mappings': None,           # nilai -> (teks, warna)
+    # timeseries
+    'fill': 20,
+    'gradient': 'opacity',
+    'line': 'smooth',
+    'point_size': 5,
+    'threshold_style': 'off',
+    'legend_calcs': ['lastNotNull', 'max'],
+    'legend_mode': 'table',
+    'tooltip_sort': 'desc',
+}
+
+
+def threshold_steps(thresholds):
+    return {'mode': 'absolute', 'steps': [{'color': color, 'value': value} for value, color in thresholds]}
+
+
+def field_config(spec):
+    defaults = {}
+    if spec['type'] == 'timeseries':
+        defaults['color'] = {'mode': spec['color'] or 'palette-classic'}
+        defaults['custom'] = {
+            'axisPlacement': 'auto',
+            'barAlignment': 0,
+            'drawStyle': 'line',
+            'fillOpacity': spec['fill'],
+            'gradientMode': spec['gradient'],
+            'hideFrom': {'legend': False, 'tooltip': False, 'vis': False},
+            'lineInterpolation': spec['line'],
+            'lineWidth': 2,
+            'pointSize': spec['point_size'],
+            'scaleDistribution': {'type': 'linear'},
+            'showPoints': 'auto',
+            'spanNulls': False,
+            'stacking': {'group': 'A', 'mode': 'none'},
+            'thresholdsStyle': {'mode': spec['threshold_style']},
+        }
+    else:
+        if spec['mappings']:
+            defaults['mappings'] = [{'type': 'value', 'options': {
+                str(value): {'text': text, 'color': color} for value, (text, color) in spec['mappings'].items()}}]
+        defaults['color'] = {'mode': spec['color'] or 'thresholds'}
+        defaults['thresholds'] = threshold_steps(spec['thresholds'] or [(None, 'green')])
+    if spec['unit']:
+        defaults['unit'] = spec['unit']
+    if spec['min'] is not None:
+        defaults['min'] = spec['min']
+    if spec['type'] == 'timeseries' and spec['thresholds']:
+        defaults['thresholds'] = threshold_steps(spec['thresholds'])
+
+    config = {'defaults': defaults}
+    if spec['overrides']:
+        config['overrides'] = [{'matcher': {'id': 'byRegexp', 'options': pattern},
+                                'properties': [{'id': 'unit', 'value': unit}]}
+                               for pattern, unit in spec['overrides'].items()]
+    return config
+
+
+def panel_options(spec):
+    if spec['type'] == 'timeseries':
+        return {
+            'legend': {'calcs': spec['legend_calcs'], 'displayMode': spec['legend_mode'], 'placement': 'bottom'},
+            'tooltip': {'mode': 'multi', 'sort': spec['tooltip_sort']},
+        }
+    return {
+        'reduceOptions': {'values': False, 'calcs': ['lastNotNull'], 'fields': ''},
+        'orientation': spec['orientation'],
+        'textMode': 'value_and_name',
+        'colorMode': spec['color_mode'],
+        'graphMode': spec['graph_mode'],
+        'justifyMode': 'center',
+    }
+
+
+def panel_targets(spec):
+    targets = []
+    for ref, (expr, legend) in zip(string.ascii_uppercase, spec['queries']):
+        target = {'expr': expr, 'refId': ref, 'legendFormat': legend}
+        if spec['lint_ignore']:
+            # Ikut disimpan di JSON supaya `promql_lint.py complete-dashboard.json` memakai aturan yang sama
+            target['lintIgnore'] = spec['lint_ignore']
+        if spec['type'] == 'stat' and spec['graph_mode'] == 'none':
+            # Tanpa sparkline cukup nilai terakhir: instant query, bukan range query
+            target.update(instant=True, range=False)
+        targets.append(target)
+    return targets
+
+
+def build_panels(panels):
+    """Panel Grafana lengkap dengan id dan gridPos (dipack kiri ke kanan, baris demi baris)"""
+    result = []
+    x = y = row_height = 0
+    for panel_id, panel in enumerate(panels, 1):
+        spec = {**PANEL_DEFAULTS, **panel}
+        if x + spec['width'] > GRID_WIDTH:
+            x, y, row_height = 0, y + row_height, 0
+        result.append({
+            'id': panel_id,
+            'title': spec['title'],
+            'type': spec['type'],
+            'targets': panel_targets(spec),
+            'gridPos': {'h': spec['height'], 'w': spec['width'], 'x': x, 'y': y},
+            'options': panel_options(spec),
+            'fieldConfig': field_config(spec),
+            'datasource': DATASOURCE,
+        })
+        x += spec['width']
+        row_height = max(row_height, spec['height'])
+    return result
+
+
+def build_dashboard():
+    """Body untuk POST /api/dashboards/db"""
+    return {
+        'dashboard': {
+            'id': None,
+            'uid': DASHBOARD['uid'],
+            'title': DASHBOARD['title'],
+            'tags': DASHBOARD['tags'],
+            'timezone': '',
+            'panels': build_panels(PANELS),
+            'time': {'from': DASHBOARD['time_from'], 'to': 'now'},
+            'timepicker': {'refresh_intervals': ['5s', '10s', '30s', '1m', '5m', '15m', '30m', '1h', '2h', '1d']},
+            'refresh': DASHBOARD['refresh'],
+            'schemaVersion': 36,
+            'version': 1,
+            'weekStart': '',
+            'links': [{
+                'asDropdown': False,
+                'icon': 'external link',
+                'includeVars': False,
+                'keepTime': False,
+                'tags': [],
+                'targetBlank': True,
+                'title': title,
+                'tooltip': tooltip,
+                'type': 'link',
+                'url': url,
+            } for title, tooltip, url in LINKS],
+        },
+        'folderUid': '',
+        'message': DASHBOARD['message'],
+        'overwrite': True,
+    }
+
+
+def render(dashboard):
+    return json.dumps(dashboard, indent=2, ensure_ascii=False) + '\n'
+
+
+def lint_panels(panels, scrape_interval):
+    """Cetak semua issue, kembalikan jumlah error"""
+    errors = 0
+    for panel in panels:
+        for ref, (expr, _) in zip(string.ascii_uppercase, panel['queries']):
+            for issue in lint_query(expr, scrape_interval, panel.get('lint_ignore', ())):
+                errors += issue.severity == 'error'
+                print(f"{issue.severity.upper():<8}{issue.rule:<20}{panel['title']} / {ref}: {issue.message}")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', default=OUTPUT, help='file JSON dashboard')
+    parser.add_argument('--check', action='store_true', help='jangan tulis, gagal bila file berbeda dari spec')
+    parser.add_argument('--scrape-interval', type=float, default=SCRAPE_INTERVAL, help='scrape interval untuk lint (detik)')
+    args = parser.parse_args()
+
+    if lint_panels(PANELS, args.scrape_interval):
+        sys.exit('query dashboard punya error lint, file tidak ditulis')
+
+    content = render(build_dashboard())
+    if args.check:
+        with open(args.output, encoding='utf-8') as f:
+            if f.read() != content:
+                sys.exit(f'{args.output} tidak sama dengan grafana/dashboard_spec.py, jalankan generate_dashboard.py')
+        print(f'{args.output} sesuai spec ({len(PANELS)} panel)')
+        return
+
+    # Tulis ke file sementara lalu rename, sama seperti generate_targets.py
+    tmp = f'{args.output}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(content)
+    if os.path.exists(args.output):
+        os.chmod(tmp, os.stat(args.output).st_mode)
+    os.replace(tmp, args.output)
+    print(f'{args.output}: {len(PANELS)} panel, {len(content) // 1024} KB')
+
+
+if __name__ == '__main__':
+    main()
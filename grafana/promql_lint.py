@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""Linter biaya query PromQL untuk dashboard Grafana.
+
+Setiap query panel diparse (parser PromQL kecil, cukup untuk struktur
+query dashboard) lalu dicek pola yang membuat dashboard lambat dibuka:
+
+- histogram-quantile  `histogram_quantile` langsung di atas bucket mentah
+                      (satu quantile per series) atau agregasi tanpa `le`
+- rate-window         window `rate`/`irate`/`increase` lebih pendek dari 4x
+                      scrape interval (hasilnya kosong / melompat-lompat)
+- no-matchers         selector tanpa label matcher (membaca semua series metric)
+- unaggregated        hasil tidak diagregasi, satu series per instance/label
+- series-count        (dengan --prometheus) panel mengembalikan terlalu banyak series
+
+Series hasil recording rule (`level:metric:operasi`) dianggap sudah
+diagregasi. Aturan bisa dilewati per panel lewat key `lint_ignore` di
+dashboard_spec.py; generator menuliskannya sebagai `lintIgnore` di setiap
+target, jadi expr di dashboard tetap bersih.
+
+Jalankan dari root project:
+    python grafana/promql_lint.py complete-dashboard.json
+    python grafana/promql_lint.py complete-dashboard.json --prometheus http://localhost:9090
+    python grafana/promql_lint.py --expr 'histogram_quantile(0.95, rate(x_bucket[1m]))'
+"""
+
+import argparse
+import json
+import re
+import sys
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import namedtuple
+
+# Scrape interval job aplikasi & node-exporter di prometheus.yml
+SCRAPE_INTERVAL = 5
+MAX_SERIES = 1000
+
+AGGREGATIONS = {'sum', 'avg', 'min', 'max', 'count', 'group', 'stddev', 'stdvar',
+                'topk', 'bottomk', 'quantile', 'count_values', 'limitk', 'limit_ratio'}
+RATE_FUNCTIONS = {'rate', 'irate', 'increase'}
+BINARY_KEYWORDS = {'and', 'or', 'unless'}
+UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800, 'y': 31536000}
+
+TOKEN = re.compile(r'''
+    (?P<space>\s+|\#[^\n]*)
+  | (?P<duration>(?:\d+(?:ms|[smhdwy]))+)
+  | (?P<number>0x[0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<string>"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|`[^`]*`)
+  | (?P<variable>\$\{\w+\}|\$\w+)
+  | (?P<colon>:)
+  | (?P<ident>[a-zA-Z_][\w:]*)
+  | (?P<op>=~|!~|!=|==|<=|>=|[-+*/%^<>=])
+  | (?P<punct>[(){}\[\],@])
+''', re.VERBOSE)
+
+Selector = namedtuple('Selector', 'name matchers range')
+Matcher = namedtuple('Matcher', 'label op value')
+Call = namedtuple('Call', 'func args')
+Aggregation = namedtuple('Aggregation', 'op grouping without args')
+Binary = namedtuple('Binary', 'ops operands')
+Subquery = namedtuple('Subquery', 'expr range')
+Literal = namedtuple('Literal', 'value')
+Issue = namedtuple('Issue', 'severity rule message')
+
+
+class PromQLError(ValueError):
+    pass
+
+
+def tokenize(text):
+    tokens = []
+    position = 0
+    while position < len(text):
+        match = TOKEN.match(text, position)
+        if not match:
+            raise PromQLError(f'unexpected character {text[position]!r} at {position}')
+        if match.lastgroup != 'space':
+            tokens.append((match.lastgroup, match.group()))
+        position = match.end()
+    return tokens
+
+
+def duration_seconds(text):
+    """Durasi PromQL (`1h30m`) dalam detik; None untuk variabel Grafana seperti `$__rate_interval`"""
+    if text.startswith('$'):
+        return None
+    return sum(int(number) * UNITS[unit] for number, unit in re.findall(r'(\d+)(ms|[smhdwy])', text))
+
+
+def is_recorded(name):
+    """Series hasil recording rule (`level:metric:operasi`)"""
+    return bool(name) and ':' in name
+
+
+class Parser:
+    """Parser recursive descent untuk subset PromQL yang dipakai dashboard.
+
+    Presedensi operator biner tidak dibedakan (operand disimpan berurutan),
+    karena linter hanya butuh struktur selector, fungsi, dan agregasi.
+    """
+
+    def __init__(self, text):
+        self.tokens = tokenize(text)
+        self.position = 0
+
+    def peek(self, offset=0):
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def next(self):
+        token = self.peek()
+        if token[0] is None:
+            raise PromQLError('unexpected end of query')
+        self.position += 1
+        return token
+
+    def expect(self, value):
+        kind, text = self.next()
+        if text != value:
+            raise PromQLError(f'expected {value!r}, got {text!r}')
+
+    def parse(self):
+        node = self.parse_expr()
+        if self.peek()[0] is not None:
+            raise PromQLError(f'unexpected {self.peek()[1]!r}')
+        return node
+
+    def parse_expr(self):
+        operands, ops = [self.parse_unary()], []
+        while True:
+            kind, text = self.peek()
+            if not (kind == 'op' and text not in ('=~', '!~', '=') or kind == 'ident' and text in BINARY_KEYWORDS):
+                break
+            ops.append(self.next()[1])
+            if self.peek()[1] == 'bool':
+                self.next()
+            if self.peek()[1] in ('on', 'ignoring'):
+                self.next()
+                self.parse_labels()
+            if self.peek()[1] in ('group_left', 'group_right'):
+                self.next()
+                if self.peek()[1] == '(':
+                    self.parse_labels()
+            operands.append(self.parse_unary())
+        return operands[0] if len(operands) == 1 else Binary(ops, operands)
+
+    def parse_unary(self):
+        if self.peek()[1] in ('-', '+'):
+            self.next()
+            return self.parse_unary()
+        return self.parse_postfix(self.parse_primary())
+
+    def parse_postfix(self, node):
+        while True:
+            text = self.peek()[1]
+            if text == '[':
+                self.next()
+                window = self.next()[1]
+                if self.peek()[1] == ':':
+                    self.next()
+                    if self.peek()[1] != ']':
+                        self.next()
+                    node = Subquery(node, window)
+                elif isinstance(node, Selector):
+                    node = node._replace(range=window)
+                else:
+                    raise PromQLError('range selector on a non-selector expression')
+                self.expect(']')
+            elif text in ('offset', '@'):
+                self.next()
+                if self.peek()[1] == '-':
+                    self.next()
+                self.next()
+                if self.peek()[1] == '(':  # @ start() / @ end()
+                    self.next()
+                    self.expect(')')
+            else:
+                return node
+
+    def parse_primary(self):
+        kind, text = self.next()
+        if text == '(':
+            node = self.parse_expr()
+            self.expect(')')
+            return node
+        if kind in ('number', 'string', 'variable') or text in ('Inf', 'NaN', 'inf', 'nan'):
+            return Literal(text)
+        if text == '{':
+            self.position -= 1
+            return Selector(None, self.parse_matchers(), None)
+        if kind != 'ident':
+            raise PromQLError(f'unexpected {text!r}')
+        if text in AGGREGATIONS and self.peek()[1] in ('(', 'by', 'without'):
+            return self.parse_aggregation(text)
+        if self.peek()[1] == '(':
+            return Call(text, self.parse_args())
+        matchers = self.parse_matchers() if self.peek()[1] == '{' else []
+        return Selector(text, matchers, None)
+
+    def parse_aggregation(self, op):
+        grouping, without = [], False
+        if self.peek()[1] in ('by', 'without'):
+            without = self.next()[1] == 'without'
+            grouping = self.parse_labels()
+        args = self.parse_args()
+        if self.peek()[1] in ('by', 'without'):
+            without = self.next()[1] == 'without'
+            grouping = self.parse_labels()
+        return Aggregation(op, grouping, without, args)
+
+    def parse_args(self):
+        self.expect('(')
+        args = []
+        while self.peek()[1] != ')':
+            args.append(self.parse_expr())
+            if self.peek()[1] == ',':
+                self.next()
+        self.expect(')')
+        return args
+
+    def parse_labels(self):
+        self.expect('(')
+        labels = []
+        while self.peek()[1] != ')':
+            labels.append(self.next()[1].strip('"'))
+            if self.peek()[1] == ',':
+                self.next()
+        self.expect(')')
+        return labels
+
+    def parse_matchers(self):
+        self.expect('{')
+        matchers = []
+        while self.peek()[1] != '}':
+            label = self.next()[1].strip('"')
+            if self.peek()[1] in (',', '}'):  # {"metric.name"}
+                matchers.append(Matcher('__name__', '=', label))
+            else:
+                op = self.next()[1]
+                matchers.append(Matcher(label, op, self.next()[1][1:-1]))
+            if self.peek()[1] == ',':
+                self.next()
+        self.expect('}')
+        return matchers
+
+
+def parse(expr):
+    return Parser(expr).parse()
+
+
+def walk(node):
+    yield node
+    if isinstance(node, (Call, Aggregation)):
+        children = node.args
+    elif isinstance(node, Binary):
+        children = node.operands
+    elif isinstance(node, Subquery):
+        children = [node.expr]
+    else:
+        children = []
+    for child in children:
+        yield from walk(child)
+
+
+def metric_name(selector):
+    if selector.name:
+        return selector.name
+    return next((m.value for m in selector.matchers if m.label == '__name__' and m.op == '='), None)
+
+
+def aggregated(node):
+    """Apakah jumlah series hasil tidak bergantung pada jumlah instance/label"""
+    if isinstance(node, (Aggregation, Literal)):
+        return True
+    if isinstance(node, Selector):
+        return is_recorded(metric_name(node))
+    if isinstance(node, Subquery):
+        return aggregated(node.expr)
+    if isinstance(node, Binary):
+        return all(aggregated(operand) for operand in node.operands)
+    if node.func in ('scalar', 'time', 'vector', 'absent', 'absent_over_time'):
+        return True
+    return all(aggregated(arg) for arg in node.args)
+
+
+def check_histogram(call):
+    """histogram_quantile harus di atas bucket yang sudah dijumlahkan per `le`"""
+    if len(call.args) != 2:
+        return None
+    buckets = call.args[1]
+    if isinstance(buckets, Aggregation):
+        keeps_le = ('le' not in buckets.grouping) if buckets.without else ('le' in buckets.grouping)
+        if not keeps_le:
+            return Issue('error', 'histogram-quantile',
+                         f'{buckets.op}() drops the "le" label, histogram_quantile needs it')
+        return None
+    selectors = [node for node in walk(buckets) if isinstance(node, Selector)]
+    if selectors and all(is_recorded(metric_name(node)) for node in selectors):
+        return None
+    return Issue('error', 'histogram-quantile',
+                 'histogram_quantile over unaggregated buckets computes one quantile per series; '
+                 'wrap the buckets in sum by (le, ...) or use a recording rule')
+
+
+def check_rate_window(call, scrape_interval):
+    target = call.args[0] if call.args else None
+    window = target.range if isinstance(target, (Selector, Subquery)) else None
+    seconds = duration_seconds(window) if window else None
+    minimum = 4 * scrape_interval
+    if seconds is not None and seconds < minimum:
+        return Issue('error', 'rate-window',
+                     f'{call.func}() window {window} is shorter than 4x the {scrape_interval:g}s scrape interval ({minimum:g}s)')
+    return None
+
+
+def lint_query(expr, scrape_interval=SCRAPE_INTERVAL, ignore=()):
+    """Daftar Issue untuk satu query PromQL, kecuali aturan di `ignore`"""
+    try:
+        tree = parse(expr)
+    except PromQLError as exc:
+        return [Issue('error', 'syntax', str(exc))]
+
+    issues = []
+    for node in walk(tree):
+        if isinstance(node, Call) and node.func == 'histogram_quantile':
+            issues.append(check_histogram(node))
+        elif isinstance(node, Call) and node.func in RATE_FUNCTIONS:
+            issues.append(check_rate_window(node, scrape_interval))
+        elif isinstance(node, Selector) and not is_recorded(metric_name(node)):
+            if not [m for m in node.matchers if m.label != '__name__']:
+                issues.append(Issue('warning', 'no-matchers',
+                                    f'{metric_name(node) or "selector"} has no label matchers '
+                                    'and reads every series of the metric'))
+    if not aggregated(tree):
+        issues.append(Issue('warning', 'unaggregated',
+                            'result is not aggregated and returns one series per instance/label combination'))
+    return [issue for issue in issues if issue and issue.rule not in ignore]
+
+
+def dashboard_queries(dashboard):
+    """(judul panel, refId, expr, aturan yang dilewati) untuk setiap target Prometheus, termasuk panel di dalam row"""
+    dashboard = dashboard.get('dashboard', dashboard)
+    panels = list(dashboard.get('panels', []))
+    while panels:
+        panel = panels.pop(0)
+        panels.extend(panel.get('panels', []))
+        for target in panel.get('targets', []):
+            if target.get('expr'):
+                yield panel.get('title', ''), target.get('refId', ''), target['expr'], target.get('lintIgnore', ())
+
+
+def series_count(prometheus, expr, timeout=10):
+    """Jumlah series yang dikembalikan query saat ini (instant query `count(...)`)"""
+    # Newline supaya komentar PromQL di akhir expr tidak menelan kurung penutup
+    url = f"{prometheus.rstrip('/')}/api/v1/query?" + urllib.parse.urlencode({'query': f'count(\n{expr}\n)'})
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        result = json.load(response)['data']['result']
+    return int(float(result[0]['value'][1])) if result else 0
+
+
+def lint_dashboard(dashboard, scrape_interval=SCRAPE_INTERVAL, prometheus=None, max_series=MAX_SERIES):
+    """List (judul panel, refId, Issue) untuk seluruh dashboard"""
+    findings = []
+    panel_series = {}
+    for title, ref, expr, ignore in dashboard_queries(dashboard):
+        findings.extend((title, ref, issue) for issue in lint_query(expr, scrape_interval, ignore))
+        if prometheus:
+            panel_series[title] = panel_series.get(title, 0) + series_count(prometheus, expr)
+    for title, count in panel_series.items():
+        if count > max_series:
+            findings.append((title, '', Issue('error', 'series-count',
+                                              f'panel returns {count} series (limit {max_series})')))
+    return findings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('dashboard', nargs='?', help='file JSON dashboard (boleh format import API)')
+    parser.add_argument('--expr', action='append', default=[], help='lint satu query (boleh beberapa)')
+    parser.add_argument('--scrape-interval', type=float, default=SCRAPE_INTERVAL, help='scrape interval (detik)')
+    parser.add_argument('--prometheus', help='URL Prometheus untuk menghitung series per panel, contoh http://localhost:9090')
+    parser.add_argument('--max-series', type=int, default=MAX_SERIES, help='batas series per panel')
+    parser.add_argument('--strict', action='store_true', help='warning juga membuat exit code 1')
+    args = parser.parse_args()
+    if not args.dashboard and not args.expr:
+        parser.error('butuh file dashboard atau --expr')
+
+    findings = [('--expr', '', issue) for expr in args.expr for issue in lint_query(expr, args.scrape_interval)]
+    if args.dashboard:
+        with open(args.dashboard, encoding='utf-8') as f:
+            dashboard = json.load(f)
+        try:
+            findings += lint_dashboard(dashboard, args.scrape_interval, args.prometheus, args.max_series)
+        except (urllib.error.URLError, OSError) as exc:
+            sys.exit(f'Prometheus tidak bisa diakses: {exc}')
+
+    for title, ref, issue in findings:
+        where = f'{title} / {ref}' if ref else title
+        print(f'{issue.severity.upper():<8}{issue.rule:<20}{where}: {issue.message}')
+    failing = [issue for _, _, issue in findings if issue.severity == 'error' or args.strict]
+    print(f'{len(findings)} issue, {len(failing)} gagal')
+    sys.exit(1 if failing else 0)
+
+
+if __name__ == '__main__':
+    main()
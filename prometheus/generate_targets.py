@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""Generate target file_sd Prometheus dari docker-compose.yml.
+
+Setiap service dengan label `prometheus.scrape: "true"` menjadi satu file
+`targets/<service>.json` berisi satu target per replica (`deploy.replicas`,
+`scale`, atau `--scale service=N`). Prometheus membaca ulang file ini
+otomatis (file_sd_configs), jadi scale aplikasi tidak perlu restart.
+File override (`-f`) boleh memakai `!reset` dan `${VAR:-default}` seperti compose.
+
+Jalankan dari root project:
+    python prometheus/generate_targets.py
+    python prometheus/generate_targets.py --scale ecommerce-app=3 --scale social-app=2
+    python prometheus/generate_targets.py -f docker-compose.yml -f docker-compose.scaled.yml
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+try:
+    import yaml
+except ImportError:
+    sys.exit('PyYAML diperlukan: pip install pyyaml')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGETS_DIR = os.path.join(ROOT, 'prometheus', 'targets')
+# ${VAR}, ${VAR:-default} (kosong / tidak ada), ${VAR-default} (tidak ada), dan $$
+INTERPOLATION = re.compile(r'\$\$|\$\{(\w+)(?:(:?-)([^}]*))?\}')
+RESET = object()
+
+
+class ComposeLoader(yaml.SafeLoader):
+    """SafeLoader yang mengenal tag `!reset` dari file override compose"""
+
+
+ComposeLoader.add_constructor('!reset', lambda loader, node: RESET)
+
+
+def substitute(match):
+    if match.group(0) == '$$':
+        return '$'
+    name, operator, default = match.groups()
+    value = os.environ.get(name)
+    if operator == ':-' and not value or operator == '-' and value is None:
+        return default
+    return value or ''
+
+
+def interpolate(value):
+    """Substitusi variabel environment seperti compose"""
+    if isinstance(value, str):
+        return INTERPOLATION.sub(substitute, value)
+    if isinstance(value, dict):
+        return {key: interpolate(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [interpolate(item) for item in value]
+    return value
+
+
+def load_compose(paths):
+    """Gabungkan beberapa file compose seperti `docker compose -f a -f b` (service di-merge per key)"""
+    merged = {'services': {}}
+    for path in paths:
+        with open(path) as f:
+            document = interpolate(yaml.load(f, Loader=ComposeLoader) or {})
+        if 'name' in document:
+            merged['name'] = document['name']
+        for name, service in (document.get('services') or {}).items():
+            current = merged['services'].setdefault(name, {})
+            for key, value in (service or {}).items():
+                if value is RESET:
+                    # `key: !reset ...` menghapus nilai dari file sebelumnya
+                    current.pop(key, None)
+                elif isinstance(value, dict) and isinstance(current.get(key), dict):
+                    current[key] = {**current[key], **value}
+                else:
+                    current[key] = value
+    return merged
+
+
+def project_name(compose, path):
+    """Nama project compose: `name:`, COMPOSE_PROJECT_NAME, atau nama folder"""
+    name = compose.get('name') or os.environ.get('COMPOSE_PROJECT_NAME') \
+        or os.path.basename(os.path.dirname(os.path.abspath(path)))
+    return re.sub(r'[^a-z0-9_-]', '', name.lower())
+
+
+def service_labels(service):
+    labels = service.get('labels') or {}
+    if isinstance(labels, list):
+        labels = dict(item.split('=', 1) if '=' in item else (item, '') for item in labels)
+    return {key: str(value) for key, value in labels.items()}
+
+
+def container_port(service, labels):
+    """Port metrics di dalam container: label prometheus.port, lalu ports, lalu expose"""
+    if 'prometheus.port' in labels:
+        return int(labels['prometheus.port'])
+    for port in service.get('ports') or []:
+        if isinstance(port, dict):
+            return int(port['target'])
+        # "8001:8000", "127.0.0.1:8001:8000", "8000/tcp"
+        return int(str(port).split('/')[0].rsplit(':', 1)[-1])
+    for port in service.get('expose') or []:
+        return int(str(port).split('/')[0])
+    raise ValueError('port metrics tidak diketahui, tambahkan label prometheus.port')
+
+
+def replica_count(service, override=None):
+    if override is not None:
+        return override
+    deploy = service.get('deploy') or {}
+    return int(deploy.get('replicas', service.get('scale', 1)))
+
+
+def service_targets(project, name, service, replicas):
+    """Satu grup target file_sd per replica"""
+    labels = service_labels(service)
+    port = container_port(service, labels)
+    path = labels.get('prometheus.path', '/metrics')
+    groups = []
+    for replica in range(1, replicas + 1):
+        if replicas == 1 and service.get('container_name'):
+            host = service['container_name']
+        else:
+            # Nama container replica bawaan compose v2, juga alias DNS di network
+            host = f'{project}-{name}-{replica}'
+        group_labels = {'job': name, 'instance': f'{name}-{replica}', 'replica': str(replica)}
+        if path != '/metrics':
+            group_labels['__metrics_path__'] = path
+        groups.append({'targets': [f'{host}:{port}'], 'labels': group_labels})
+    return groups
+
+
+def write_atomic(path, groups):
+    # Tulis ke file sementara lalu rename, supaya Prometheus tidak pernah
+    # membaca file yang setengah jadi
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(groups, f, indent=2)
+        f.write('\n')
+    os.replace(tmp, path)
+
+
+def parse_scale(specs):
+    scale = {}
+    for spec in specs:
+        name, _, count = spec.partition('=')
+        scale[name] = int(count)
+    return scale
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-f', '--file', action='append', dest='files',
+                        help='file compose (boleh beberapa, default docker-compose.yml)')
+    parser.add_argument('--scale', action='append', default=[],
+                        help='jumlah replica, contoh: ecommerce-app=3 (sama dengan docker compose --scale)')
+    parser.add_argument('--project', help='nama project compose (default dari compose / nama folder)')
+    parser.add_argument('--output', default=TARGETS_DIR, help='folder file target')
+    args = parser.parse_args()
+
+    files = args.files or [os.path.join(ROOT, 'docker-compose.yml')]
+    compose = load_compose(files)
+    project = args.project or project_name(compose, files[0])
+    scale = parse_scale(args.scale)
+
+    os.makedirs(args.output, exist_ok=True)
+    written = set()
+    for name, service in compose['services'].items():
+        if service_labels(service).get('prometheus.scrape', '').lower() != 'true':
+            continue
+        groups = service_targets(project, name, service, replica_count(service, scale.get(name)))
+        filename = f'{name}.json'
+        write_atomic(os.path.join(args.output, filename), groups)
+        written.add(filename)
+        print(f"{name:<16}{len(groups):>3} target  {', '.join(g['targets'][0] for g in groups)}")
+
+    # Service yang sudah tidak ada / tidak di-scrape lagi dibuang dari discovery
+    for filename in os.listdir(args.output):
+        if filename.endswith('.json') and filename not in written:
+            os.remove(os.path.join(args.output, filename))
+            print(f'hapus {filename}')
+
+
+if __name__ == '__main__':
+    main()
@@ -2,63 +2,95 @@
 
 import time
 import random
-from flask import Flask, Response
-from prometheus_client import Counter, Histogram, Gauge, generate_latest, CONTENT_TYPE_LATEST
+from flask import Flask
+from prometheus_client import Gauge
+
+from common.instrumentation import RequestMetrics
+from common.jobs import JobQueue
+from common.metrics import ExpositionCache
+from common.sessions import SessionTracker
+from common.signals import WARMUP_TICKS, OrnsteinUhlenbeck, numpy_rng
+from common.ticker import Ticker
 
 # Inisialisasi Flask app
 app = Flask(__name__)
 
+# Jumlah request dan latency per endpoint/method/status untuk semua route
+request_metrics = RequestMetrics(app, 'sample_app')
+
 # Prometheus metrics
-REQUEST_COUNT = Counter('sample_app_requests_total', 'Total number of requests', ['method', 'endpoint'])
-REQUEST_LATENCY = Histogram('sample_app_request_duration_seconds', 'Request latency')
-ACTIVE_USERS = Gauge('sample_app_active_users', 'Number of active users')
-CPU_USAGE = Gauge('sample_app_cpu_usage_percent', 'CPU usage percentage')
-MEMORY_USAGE = Gauge('sample_app_memory_usage_bytes', 'Memory usage in bytes')
+ACTIVE_USERS = Gauge('sample_app_active_users', 'Number of active users', multiprocess_mode='livemax')
+CPU_USAGE = Gauge('sample_app_cpu_usage_percent', 'CPU usage percentage', multiprocess_mode='livemostrecent')
+MEMORY_USAGE = Gauge('sample_app_memory_usage_bytes', 'Memory usage in bytes', multiprocess_mode='livemostrecent')
+
+# Active users dan pengunjung unik dari request asli (cookie / X-Client-Id)
+sessions = SessionTracker(app, 'sample_app', ACTIVE_USERS)
+
+# Selama simulasi load (ditambah LOAD_WINDOW detik sesudahnya) mean sinyal
+# CPU/memori dinaikkan; setelah itu OU kembali sendiri ke mean normal
+LOAD_WINDOW = 15.0
+load_until = 0.0
+
+def load_mean(normal, loaded):
+    return lambda t, rng: loaded if t < load_until else normal
+
+# Sinyal berkorelasi waktu (common/signals.py): nilai bergerak halus antar
+# tick, bukan undian acak independen, sehingga chunk Prometheus terkompresi baik
+CPU_SIGNAL = OrnsteinUhlenbeck(load_mean(40.0, 85.0), theta=0.1, sigma=3.0, low=10, high=95)
+MEMORY_SIGNAL = OrnsteinUhlenbeck(load_mean(175e6, 400e6), theta=0.05, sigma=3e6, low=50e6, high=500e6)
+
+def update_state(rng):
+    # Dipanggil ticker dengan interval tetap, bukan oleh setiap scrape
+    generator, now = numpy_rng(rng), ticker.now
+    sessions.refresh()
+    CPU_USAGE.set(CPU_SIGNAL(now, generator)[0])
+    MEMORY_USAGE.set(round(MEMORY_SIGNAL(now, generator)[0]))
+
+ticker = Ticker(app, 'sample_app', update_state, warmup=WARMUP_TICKS)
+exposition = ExpositionCache(ticker)
 
 @app.route('/')
 def home():
-    REQUEST_COUNT.labels(method='GET', endpoint='/').inc()
-    with REQUEST_LATENCY.time():
-        # Simulasi processing time
-        time.sleep(random.uniform(0.1, 0.5))
-        return '''
-        <h1>Sample Monitoring Application</h1>
-        <p>Aplikasi sederhana untuk demonstrasi monitoring dengan Prometheus dan Grafana</p>
-        <ul>
-            <li><a href="/metrics">Metrics endpoint</a></li>
-            <li><a href="/health">Health check</a></li>
-            <li><a href="/simulate-load">Simulate load</a></li>
-        </ul>
-        '''
+    # Simulasi processing time
+    time.sleep(random.uniform(0.1, 0.5))
+    return '''
+    <h1>Sample Monitoring Application</h1>
+    <p>Aplikasi sederhana untuk demonstrasi monitoring dengan Prometheus dan Grafana</p>
+    <ul>
+        <li><a href="/metrics">Metrics endpoint</a></li>
+        <li><a href="/health">Health check</a></li>
+        <li><a href="/simulate-load">Simulate load</a></li>
+    </ul>
+    '''
 
 @app.route('/health')
 def health():
-    REQUEST_COUNT.labels(method='GET', endpoint='/health').inc()
     return {'status': 'healthy', 'timestamp': time.time()}
 
+def run_load_simulation():
+    global load_until
+    # Simulasi beban kerja: CPU/memori naik lewat sinyal OU di tick berikutnya,
+    # bukan di-set acak, jadi series tetap halus
+    duration = random.uniform(0.5, 2.0)
+    load_until = max(load_until, time.time() + duration + LOAD_WINDOW)
+    time.sleep(duration)
+    
+    return f'Load simulation completed in {duration:.2f} seconds'
+
 @app.route('/simulate-load')
 def simulate_load():
-    REQUEST_COUNT.labels(method='GET', endpoint='/simulate-load').inc()
-    with REQUEST_LATENCY.time():
-        # Simulasi beban kerja
-        duration = random.uniform(0.5, 2.0)
-        time.sleep(duration)
-        
-        # Update metrics
-        ACTIVE_USERS.set(random.randint(10, 100))
-        CPU_USAGE.set(random.uniform(20, 80))
-        MEMORY_USAGE.set(random.randint(100000000, 500000000))  # 100MB - 500MB
-        
-        return f'Load simulation completed in {duration:.2f} seconds'
+    return run_load_simulation()
+
+# Job API: POST /jobs/<nama> lalu cek status di GET /jobs/<id>
+jobs = JobQueue(app, 'sample_app', {
+    'simulate-load': run_load_simulation,
+})
 
 @app.route('/metrics')
 def metrics():
-    # Update some metrics before serving
-    ACTIVE_USERS.set(random.randint(5, 50))
-    CPU_USAGE.set(random.uniform(10, 70))
-    MEMORY_USAGE.set(random.randint(50000000, 300000000))
-    
-    return Response(generate_latest(), mimetype=CONTENT_TYPE_LATEST)
+    # Exposition di-cache per tick; format (text/OpenMetrics/protobuf) dan
+    # kompresi (gzip/zstd) dinegosiasikan dari header Accept & Accept-Encoding
+    return exposition.response()
 
 if __name__ == '__main__':
     print("Starting Sample Monitoring Application...")
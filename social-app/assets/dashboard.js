@@ -0,0 +1,43 @@
+// Floating social media icons
+const icons = ['👍', '❤️', '💬', '🔄', '📱', '📸', '🎥', '✨'];
+const floatingContainer = document.getElementById('floating-icons');
+
+function createFloatingIcon() {
+    const icon = document.createElement('div');
+    icon.className = 'floating-icon';
+    icon.textContent = icons[Math.floor(Math.random() * icons.length)];
+    icon.style.left = Math.random() * 100 + '%';
+    icon.style.animationDuration = (Math.random() * 3 + 5) + 's';
+    icon.style.animationDelay = Math.random() * 2 + 's';
+    floatingContainer.appendChild(icon);
+
+    setTimeout(() => {
+        icon.remove();
+    }, 8000);
+}
+
+// Create floating icons every 2 seconds
+setInterval(createFloatingIcon, 2000);
+
+// Initial floating icons
+for (let i = 0; i < 5; i++) {
+    setTimeout(createFloatingIcon, i * 400);
+}
+
+// Animasi counter untuk nilai stats
+document.querySelectorAll('.stat-value').forEach(el => {
+    const text = el.textContent.replace(/,/g, '');
+    const finalValue = parseInt(text);
+    if (!isNaN(finalValue) && finalValue > 0) {
+        let currentValue = 0;
+        const increment = finalValue / 50;
+        const timer = el.counterTimer = setInterval(() => {
+            currentValue += increment;
+            if (currentValue >= finalValue) {
+                currentValue = finalValue;
+                clearInterval(timer);
+            }
+            el.textContent = Math.round(currentValue).toLocaleString();
+        }, 30);
+    }
+});
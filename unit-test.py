@@ -8,6 +8,7 @@ from bs4 import BeautifulSoup
 # ==============================
 REQUIRED_FILES = [
     "docker-compose.yml",
+    "docker-compose.scaled.yml",
     "complete-dashboard.sh",
     "complete-dashboard.json",
     "README.md",
@@ -31,6 +32,37 @@ REQUIRED_FILES = [
 
     "prometheus/Dockerfile",
     "prometheus/prometheus.yml",
+    "prometheus/generate_targets.py",
+    "prometheus/rules/recording.yml",
+    "prometheus/tests/recording_test.yml",
+    "grafana/dashboard_spec.py",
+    "grafana/generate_dashboard.py",
+    "grafana/promql_lint.py",
+    "proxy/Dockerfile",
+    "proxy/haproxy.cfg",
+
+    # Shared modules
+    "common/__init__.py",
+    "common/api.py",
+    "common/assets.py",
+    "common/collectors.py",
+    "common/feed.py",
+    "common/forecast.py",
+    "common/gunicorn_conf.py",
+    "common/ingest.py",
+    "common/instrumentation.py",
+    "common/jobs.py",
+    "common/metrics.py",
+    "common/orders.py",
+    "common/protobuf.py",
+    "common/sessions.py",
+    "common/sharedlog.py",
+    "common/signals.py",
+    "common/static/live-stats.js",
+    "common/sse.py",
+    "common/stations.py",
+    "common/ticker.py",
+    "common/topk.py",
 ]
 
 # 🎨 Warna ANSI
@@ -88,6 +120,435 @@ def check_docker_compose_services(path="docker-compose.yml"):
             raise AssertionError(f"Service '{svc}' missing")
     print(f"{GREEN}✅ Semua service ditemukan di docker-compose.yml!{RESET}")
 
+def decode_fields(data):
+    """Decode pesan protobuf jadi list (field, nilai); wire type 0, 1, dan 2 saja"""
+    import struct
+    fields, pos = [], 0
+    while pos < len(data):
+        key, pos = decode_varint(data, pos)
+        field, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, pos = decode_varint(data, pos)
+        elif wire_type == 1:
+            value, pos = struct.unpack('<d', data[pos:pos + 8])[0], pos + 8
+        elif wire_type == 2:
+            length, pos = decode_varint(data, pos)
+            value, pos = data[pos:pos + length], pos + length
+        else:
+            raise AssertionError(f"Wire type {wire_type} tidak dikenal")
+        fields.append((field, value))
+    return fields
+
+def decode_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        value |= (byte & 0x7f) << shift
+        pos, shift = pos + 1, shift + 7
+        if not byte & 0x80:
+            return value, pos
+
+def check_protobuf_exposition():
+    """Encode registry yang isinya diketahui lalu decode dengan layout field metrics.proto"""
+    spinner_print("[CHECK] Mengecek encoder protobuf exposition")
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+    from common.protobuf import generate_protobuf
+
+    registry = CollectorRegistry()
+    requests = Counter('demo_requests', 'Demo requests', ['path'], registry=registry)
+    requests.labels(path='/').inc(3)
+    requests.labels(path='/api').inc(1.5)
+    Gauge('demo_temperature', 'Demo gauge', registry=registry).set(-2.25)
+    latency = Histogram('demo_latency_seconds', 'Demo histogram', buckets=(0.1, 1.0), registry=registry)
+    for value in (0.05, 0.5, 5):
+        latency.observe(value)
+
+    # Stream length-delimited: varint panjang lalu MetricFamily
+    data, pos, families = generate_protobuf(registry), 0, {}
+    while pos < len(data):
+        length, pos = decode_varint(data, pos)
+        fields = decode_fields(data[pos:pos + length])
+        pos += length
+        family = {'type': 0, 'metrics': []}  # enum default (COUNTER) tidak ditulis
+        for field, value in fields:
+            if field == 1:
+                family['name'] = value.decode()
+            elif field == 2:
+                family['help'] = value.decode()
+            elif field == 3:
+                family['type'] = value
+            elif field == 4:
+                family['metrics'].append(decode_fields(value))
+        families[family['name']] = family
+
+    def labels_of(metric):
+        pairs = [dict(decode_fields(value)) for field, value in metric if field == 1]
+        return {pair[1].decode(): pair[2].decode() for pair in pairs}
+
+    def body_of(metric, body_field):
+        return dict(decode_fields(next(value for field, value in metric if field == body_field)))
+
+    expected = {'demo_requests_total', 'demo_temperature', 'demo_latency_seconds'}
+    if set(families) != expected:
+        print(f"{RED}[ERROR] Family protobuf: {sorted(families)}{RESET}")
+        raise AssertionError("Protobuf family mismatch")
+
+    counter = families['demo_requests_total']
+    values = {labels_of(m)['path']: body_of(m, 3)[1] for m in counter['metrics']}
+    if counter['type'] != 0 or counter['help'] != 'Demo requests' or values != {'/': 3.0, '/api': 1.5}:
+        print(f"{RED}[ERROR] Counter protobuf salah: {counter['type']} {values}{RESET}")
+        raise AssertionError("Protobuf counter mismatch")
+
+    gauge = families['demo_temperature']
+    if gauge['type'] != 1 or [body_of(m, 2)[1] for m in gauge['metrics']] != [-2.25]:
+        print(f"{RED}[ERROR] Gauge protobuf salah{RESET}")
+        raise AssertionError("Protobuf gauge mismatch")
+
+    histogram = families['demo_latency_seconds']
+    fields = decode_fields(next(value for field, value in histogram['metrics'][0] if field == 7))
+    buckets = [dict(decode_fields(value)) for field, value in fields if field == 3]
+    body = dict(fields)
+    if (histogram['type'] != 4 or body[1] != 3 or abs(body[2] - 5.55) > 1e-9
+            or [(b[2], b[1]) for b in buckets] != [(0.1, 1), (1.0, 2)]):
+        print(f"{RED}[ERROR] Histogram protobuf salah: {body} {buckets}{RESET}")
+        raise AssertionError("Protobuf histogram mismatch")
+    print(f"{GREEN}✅ Protobuf exposition bisa didecode sesuai metrics.proto!{RESET}")
+
+def check_openmetrics_multiprocess():
+    """OpenMetrics dari gabungan beberapa worker (mode multiprocess) lolos parser referensi"""
+    spinner_print("[CHECK] Mengecek OpenMetrics exposition mode multiprocess")
+    import shutil
+    import subprocess
+    import tempfile
+    from prometheus_client.openmetrics.parser import text_string_to_metric_families
+
+    # Mode multiprocess dipilih saat prometheus_client di-import, jadi worker dan
+    # pembaca dijalankan sebagai proses terpisah seperti di gunicorn
+    worker = (
+        "import sys\n"
+        "from prometheus_client import Histogram\n"
+        "h = Histogram('demo_latency_seconds', 'Demo histogram', ['path'], buckets=(0.1, 1.0))\n"
+        "h.labels(path='/').observe(0.05)\n"
+        "h.labels(path='/api').observe(float(sys.argv[1]))\n"
+    )
+    reader = "import sys\nfrom common.metrics import FORMATS\nsys.stdout.write(FORMATS['openmetrics'][0]().decode())\n"
+    directory = tempfile.mkdtemp()
+    try:
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=directory)
+        for value in ('0.5', '2'):
+            subprocess.run([sys.executable, '-c', worker, value], env=env, check=True)
+        output = subprocess.run([sys.executable, '-c', reader], env=env, check=True,
+                                capture_output=True, text=True).stdout
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    try:
+        families = {family.name: family for family in text_string_to_metric_families(output)}
+    except ValueError as exc:
+        print(f"{RED}[ERROR] Output OpenMetrics ditolak parser: {exc}{RESET}")
+        raise AssertionError("OpenMetrics exposition invalid") from None
+    samples = {(s.name, s.labels.get('path'), s.labels.get('le')): s.value
+               for s in families['demo_latency_seconds'].samples}
+    expected = {
+        ('demo_latency_seconds_count', '/', None): 2.0,
+        ('demo_latency_seconds_count', '/api', None): 2.0,
+        ('demo_latency_seconds_sum', '/api', None): 2.5,
+        ('demo_latency_seconds_bucket', '/api', '1.0'): 1.0,
+        ('demo_latency_seconds_bucket', '/api', '+Inf'): 2.0,
+    }
+    if any(samples.get(key) != value for key, value in expected.items()):
+        print(f"{RED}[ERROR] Sample histogram gabungan salah: {samples}{RESET}")
+        raise AssertionError("OpenMetrics multiprocess values mismatch")
+    print(f"{GREEN}✅ OpenMetrics mode multiprocess valid dan terkelompok per label set!{RESET}")
+
+def check_topk_error_bound():
+    """Space-Saving pada stream Zipf dibanding hitungan exact"""
+    spinner_print("[CHECK] Mengecek batas error top-K (Space-Saving)")
+    import random
+    from collections import Counter as ExactCounter
+    from common.topk import SpaceSaving
+
+    # Stream miring: 5000 item, bobot 1/rank^1.1, jauh lebih banyak dari capacity
+    rng = random.Random(42)
+    items = [f'item-{rank}' for rank in range(5000)]
+    stream = rng.choices(items, weights=[1 / (rank + 1) ** 1.1 for rank in range(5000)], k=50000)
+    exact = ExactCounter(stream)
+    sketch = SpaceSaving(capacity=200, k=10)
+    for item in stream:
+        sketch.add(item)
+
+    bound = sketch.total / sketch.capacity
+    if sketch.total != len(stream) or len(sketch.counts) > sketch.capacity:
+        print(f"{RED}[ERROR] Sketch memantau {len(sketch.counts)} item, total {sketch.total}{RESET}")
+        raise AssertionError("Space-Saving capacity mismatch")
+    for item, count in sketch.counts.items():
+        error = sketch.errors[item]
+        if not count - error <= exact[item] <= count or error > bound:
+            print(f"{RED}[ERROR] {item}: count {count} error {error}, exact {exact[item]}{RESET}")
+            raise AssertionError("Space-Saving error bound violated")
+    missing = [item for item, count in exact.items() if count > bound and item not in sketch.counts]
+    if missing:
+        print(f"{RED}[ERROR] Heavy hitter tidak terpantau: {missing}{RESET}")
+        raise AssertionError("Space-Saving missed heavy hitters")
+
+    sketch.refresh()
+    top = sketch.top(3)
+    if [item for item, _, _ in top] != [item for item, _ in exact.most_common(3)]:
+        print(f"{RED}[ERROR] Top-3 sketch {top} != exact {exact.most_common(3)}{RESET}")
+        raise AssertionError("Space-Saving top-K mismatch")
+    print(f"{GREEN}✅ Top-K dalam batas error Space-Saving!{RESET}")
+
+def check_ingest_atomic():
+    """Batch ingest dengan satu record rusak harus ditolak utuh"""
+    spinner_print("[CHECK] Mengecek ingest batch atomik")
+    import json
+    import struct
+    from flask import Flask
+    from prometheus_client import CollectorRegistry, Counter
+    from common.ingest import CONTENT_TYPE_BINARY, CONTENT_TYPE_NDJSON, EventIngest
+
+    # Registry sendiri supaya tidak bentrok dengan counter app di REGISTRY global
+    registry = CollectorRegistry()
+    counters = {kind: Counter(f'demo_{kind}s', f'Demo {kind}s', ['platform'], registry=registry)
+                for kind in ('like', 'share')}
+    app = Flask('ingest-test')
+    EventIngest(app, 'platform', ['twitter', 'instagram'], counters)
+    client = app.test_client()
+
+    def totals():
+        return {(kind, platform): registry.get_sample_value(f'demo_{kind}s_total', {'platform': platform})
+                for kind in ('like', 'share') for platform in ('twitter', 'instagram')}
+
+    def ndjson(events):
+        return '\n'.join(json.dumps(event) for event in events)
+
+    valid = [{'platform': 'twitter', 'type': 'like', 'count': 3},
+             {'platform': 'instagram', 'type': 'share'}]
+    before = totals()
+    bad_batches = [
+        (ndjson(valid + [{'platform': 'tiktok', 'type': 'like'}]), CONTENT_TYPE_NDJSON),
+        (ndjson(valid + [{'platform': 'twitter', 'type': 'like', 'count': -1}]), CONTENT_TYPE_NDJSON),
+        (ndjson(valid) + '\n{"platform": ', CONTENT_TYPE_NDJSON),
+        (struct.pack('<BBI', 0, 0, 5) + struct.pack('<BBI', 2, 0, 1), CONTENT_TYPE_BINARY),
+    ]
+    for body, content_type in bad_batches:
+        response = client.post('/api/events', data=body, content_type=content_type)
+        if response.status_code != 400 or totals() != before:
+            print(f"{RED}[ERROR] Batch rusak ({content_type}) status {response.status_code}, counter berubah: {totals()}{RESET}")
+            raise AssertionError("Ingest batch not rejected atomically")
+
+    response = client.post('/api/events', data=ndjson(valid), content_type=CONTENT_TYPE_NDJSON)
+    expected = dict(before)
+    expected['like', 'twitter'] += 3
+    expected['share', 'instagram'] += 1
+    if response.status_code != 200 or totals() != expected:
+        print(f"{RED}[ERROR] Batch valid tidak diterapkan: {response.status_code} {totals()}{RESET}")
+        raise AssertionError("Ingest valid batch mismatch")
+    print(f"{GREEN}✅ Ingest menolak batch rusak tanpa mengubah counter!{RESET}")
+
+def check_rolling_windows():
+    """Nilai RollingWindows keluar tepat di batas setiap window"""
+    spinner_print("[CHECK] Mengecek expiry RollingWindows")
+    from common.orders import WINDOWS, RollingWindows
+
+    windows = RollingWindows(['orders', 'revenue_cents'], WINDOWS)
+    windows.add([1, 100], now=1000)
+    windows.add([2, 250], now=1030)
+
+    # (detik, window, orders yang diharapkan); waktu harus naik karena ring ikut maju
+    expected = [
+        (1030, '1m', 3), (1059, '1m', 3), (1060, '1m', 2), (1089, '1m', 2), (1090, '1m', 0),
+        (1090, '5m', 3), (1299, '5m', 3), (1300, '5m', 2), (1329, '5m', 2), (1330, '5m', 0),
+        (1330, '1h', 3), (4599, '1h', 3), (4600, '1h', 2), (4629, '1h', 2), (4630, '1h', 0),
+    ]
+    for now, window, orders in expected:
+        totals = windows.totals(window, now=now)
+        if totals['orders'] != orders:
+            print(f"{RED}[ERROR] Window {window} di detik {now}: {totals}, harusnya {orders} order{RESET}")
+            raise AssertionError("RollingWindows expiry mismatch")
+
+    # Lompatan waktu melebihi window terbesar mengosongkan semua bucket
+    windows.add([5, 500], now=20000)
+    totals = {window: windows.totals(window, now=20000) for window in WINDOWS}
+    if any(values != {'orders': 5, 'revenue_cents': 500} for values in totals.values()):
+        print(f"{RED}[ERROR] Window setelah lompatan waktu: {totals}{RESET}")
+        raise AssertionError("RollingWindows reset mismatch")
+    print(f"{GREEN}✅ RollingWindows expire tepat di batas window!{RESET}")
+
+def check_unique_visitors_hll():
+    """Estimasi HyperLogLog dalam ~2% dari jumlah unik asli, juga saat digabung lintas worker"""
+    spinner_print("[CHECK] Mengecek akurasi HyperLogLog unique visitors")
+    import shutil
+    import tempfile
+    from common.sessions import MinuteSketches, client_hash
+
+    now = 1_700_000_000
+    windows = {'15m': 15, '1h': 60}
+    for n in (10_000, 100_000):
+        sketches = MinuteSketches()
+        for k in range(n):
+            sketches.add(client_hash(f'visitor-{k}'), now - k % 600)
+        first = sketches.estimates(windows, now)
+        # Klien yang kembali tidak menambah hitungan (register hanya diambil max-nya)
+        for k in range(0, n, 7):
+            sketches.add(client_hash(f'visitor-{k}'), now)
+        for window, estimate in sketches.estimates(windows, now).items():
+            if abs(estimate / n - 1) > 0.025 or estimate != first[window]:
+                print(f"{RED}[ERROR] Estimasi {window} untuk {n} klien unik: {estimate} (awal {first[window]}){RESET}")
+                raise AssertionError("HyperLogLog estimate out of tolerance")
+
+    # Dua worker dengan klien yang beririsan: gabungan register, bukan jumlah estimasi.
+    # Nama file worker eksplisit; pembaca memakai pola yang sama seperti di gunicorn.
+    directory = tempfile.mkdtemp()
+    try:
+        pattern = os.path.join(directory, 'hll-test-{pid}.bin')
+        worker_a = MinuteSketches(path=pattern, worker='a')
+        worker_b = MinuteSketches(path=pattern, worker='b')
+        for k in range(6000):
+            worker_a.add(client_hash(f'visitor-{k}'), now - k % 600)
+        for k in range(4000, 10_000):
+            worker_b.add(client_hash(f'visitor-{k}'), now - k % 600)
+        reader = MinuteSketches(path=pattern, worker='reader')
+        union = reader.estimate(60, now)
+        files = sorted(os.listdir(directory))
+        if files != ['hll-test-a.bin', 'hll-test-b.bin', 'hll-test-reader.bin']:
+            print(f"{RED}[ERROR] File sketch worker: {files}{RESET}")
+            raise AssertionError("HyperLogLog worker files mismatch")
+        if abs(union / 10_000 - 1) > 0.025:
+            print(f"{RED}[ERROR] Estimasi gabungan 2 worker: {union}, harusnya ~10000{RESET}")
+            raise AssertionError("HyperLogLog union out of tolerance")
+        # Setengah jam kemudian semua menit tadi sudah di luar window 15m
+        later = reader.estimate(15, now + 30 * 60)
+        if later != 0:
+            print(f"{RED}[ERROR] Klien 30 menit lalu masih dihitung di window 15m: {later}{RESET}")
+            raise AssertionError("HyperLogLog window mismatch")
+
+        # Active users: klien yang bergantian dilayani dua worker tetap satu orang
+        active = os.path.join(directory, 'active-{pid}.bin')
+        workers = [MinuteSketches(path=active, worker=name) for name in ('a', 'b', 'c')]
+        for k in range(30):
+            workers[k % 3].add(client_hash(f'user-{k % 10}'), now + 3600 + k)
+        count = MinuteSketches(path=active, worker='reader').estimate(5, now + 3630)
+        if count != 10:
+            print(f"{RED}[ERROR] 10 klien di 3 worker terhitung {count} active users{RESET}")
+            raise AssertionError("Active users counted per worker")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    print(f"{GREEN}✅ Estimasi HyperLogLog dalam toleransi, juga lintas worker!{RESET}")
+
+def check_station_updates():
+    """Lompatan /update-weather diterapkan sama persis oleh semua worker"""
+    spinner_print("[CHECK] Mengecek lompatan cuaca lintas worker")
+    import random
+    from common.feed import ActivityFeed
+    from common.signals import numpy_rng
+    from common.stations import CITIES, StationRegistry
+
+    # Dua worker berbagi feed lompatan; worker ketiga start belakangan dan memutar ulang tick lampau
+    feed = ActivityFeed(capacity=16)
+    workers = [StationRegistry(CITIES, feed), StationRegistry(CITIES, feed)]
+    for index in range(30):
+        if index == 5:
+            feed_id = workers[0].request_update(10.0, {'temperature': (100.0, 100.5)})
+        if index == 20:
+            late = StationRegistry(CITIES, feed)
+            for past in range(index):
+                late.step(float(past), numpy_rng(random.Random(f'weather:{past}')))
+            workers.append(late)
+        for worker in workers:
+            worker.step(float(index), numpy_rng(random.Random(f'weather:{index}')))
+        values = [worker.get('jakarta') for worker in workers]
+        if any(value != values[0] for value in values):
+            print(f"{RED}[ERROR] Worker berbeda di tick {index}: {values}{RESET}")
+            raise AssertionError("Weather workers diverged")
+        if index == 10 and not 100.0 <= values[0]['temperature'] <= 100.5:
+            print(f"{RED}[ERROR] Lompatan {feed_id} tidak diterapkan di tick 10: {values[0]}{RESET}")
+            raise AssertionError("Weather update not applied")
+    print(f"{GREEN}✅ Lompatan cuaca sama di semua worker!{RESET}")
+
+def check_promql_lint():
+    """Setiap aturan grafana/promql_lint.py menangkap pola yang dimaksud"""
+    spinner_print("[CHECK] Mengecek aturan promql_lint")
+    sys.path.insert(0, 'grafana')
+    from promql_lint import lint_dashboard, lint_query
+
+    # (expr, scrape interval, aturan yang dilewati, aturan yang diharapkan muncul)
+    cases = [
+        ('histogram_quantile(0.95, rate(x_bucket{job="a"}[5m]))', 5, (), {'histogram-quantile', 'unaggregated'}),
+        ('histogram_quantile(0.95, sum by (job) (rate(x_bucket{job="a"}[5m])))', 5, (), {'histogram-quantile'}),
+        ('histogram_quantile(0.95, sum by (job, le) (rate(x_bucket{job="a"}[5m])))', 5, (), set()),
+        ('histogram_quantile(0.95, sum without (instance) (rate(x_bucket{job="a"}[5m])))', 5, (), set()),
+        ('histogram_quantile(0.95, job_le:x_bucket:rate5m)', 5, (), set()),
+        ('sum by (job) (rate(x_total{job="a"}[15s]))', 5, (), {'rate-window'}),
+        ('sum by (job) (rate(x_total{job="a"}[20s]))', 5, (), set()),
+        ('sum by (job) (increase(x_total{job="a"}[30s]))', 10, (), {'rate-window'}),
+        ('sum by (job) (up)', 5, (), {'no-matchers'}),
+        ('sum by (job) (up{job="a"})', 5, (), set()),
+        ('up{job="a"}', 5, (), {'unaggregated'}),
+        ('job:requests:rate5m / job:replicas:count', 5, (), set()),
+        ('min by (job) (up)', 5, ['no-matchers'], set()),
+        ('histogram_quantile(0.95, rate(x_bucket[1m]))', 5, ['histogram-quantile', 'unaggregated'], {'no-matchers'}),
+        ('sum by (job) (rate(x_total{job="a"}[5m]', 5, (), {'syntax'}),
+    ]
+    for expr, scrape_interval, ignore, expected in cases:
+        rules = {issue.rule for issue in lint_query(expr, scrape_interval, ignore)}
+        if rules != expected:
+            print(f"{RED}[ERROR] {expr} (ignore {list(ignore)}): {sorted(rules)}, harusnya {sorted(expected)}{RESET}")
+            raise AssertionError("promql_lint rule mismatch")
+
+    # lintIgnore di target dashboard (ditulis generate_dashboard.py) juga dihormati
+    dashboard = {'panels': [{'title': 'Health', 'targets': [
+        {'refId': 'A', 'expr': 'min by (job) (up)', 'lintIgnore': ['no-matchers']},
+        {'refId': 'B', 'expr': 'min by (job) (up)'},
+    ]}]}
+    findings = [(ref, issue.rule) for _, ref, issue in lint_dashboard(dashboard)]
+    if findings != [('B', 'no-matchers')]:
+        print(f"{RED}[ERROR] lintIgnore dashboard tidak dihormati: {findings}{RESET}")
+        raise AssertionError("promql_lint lintIgnore mismatch")
+    print(f"{GREEN}✅ Semua aturan promql_lint bekerja!{RESET}")
+
+def check_dashboard_generated():
+    """complete-dashboard.json harus sama persis dengan hasil grafana/dashboard_spec.py"""
+    spinner_print("[CHECK] Mengecek complete-dashboard.json sesuai dashboard_spec.py")
+    import subprocess
+    result = subprocess.run([sys.executable, os.path.join('grafana', 'generate_dashboard.py'), '--check'],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"{RED}[ERROR] {(result.stdout + result.stderr).strip()}{RESET}")
+        raise AssertionError("complete-dashboard.json out of date")
+    print(f"{GREEN}✅ complete-dashboard.json sesuai dashboard_spec.py!{RESET}")
+
+def check_job_status_order():
+    """Status job di JOBS_STATE_DIR tidak pernah mundur ke 'queued' setelah job selesai"""
+    spinner_print("[CHECK] Mengecek urutan status job queue")
+    import json
+    import shutil
+    import tempfile
+    from flask import Flask
+    from common.jobs import JobQueue
+
+    directory = tempfile.mkdtemp()
+    previous = os.environ.get('JOBS_STATE_DIR')
+    os.environ['JOBS_STATE_DIR'] = directory
+    try:
+        # Job instan: worker thread bisa selesai sebelum submit() kembali
+        jobs = JobQueue(Flask('jobs-test'), 'unittest', {'noop': lambda: 'ok'}, workers=4, max_size=1000)
+        submitted = [jobs.submit('noop') for _ in range(500)]
+        jobs.queue.join()
+        for job in submitted:
+            with open(os.path.join(directory, f'{job.id}.json')) as f:
+                stored = json.load(f)
+            if stored['status'] != 'completed':
+                print(f"{RED}[ERROR] Job {job.id} tersimpan '{stored['status']}' padahal sudah selesai{RESET}")
+                raise AssertionError("Stale job snapshot overwrote a newer status")
+    finally:
+        if previous is None:
+            os.environ.pop('JOBS_STATE_DIR', None)
+        else:
+            os.environ['JOBS_STATE_DIR'] = previous
+        shutil.rmtree(directory, ignore_errors=True)
+    print(f"{GREEN}✅ Status job tersimpan sesuai urutan!{RESET}")
+
 def main():
     print(f"{RED}=== START UNIT TEST FOR MONITORING-DOCKER PROJECT ==={RESET}\n")
 
@@ -101,6 +562,32 @@ def main():
     # 3️⃣ Cek service di docker-compose.yaml
     check_docker_compose_services()
 
+    # 4️⃣ Cek encoder protobuf exposition
+    check_protobuf_exposition()
+    check_openmetrics_multiprocess()
+
+    # 5️⃣ Cek batas error top-K
+    check_topk_error_bound()
+
+    # 6️⃣ Cek ingest batch atomik
+    check_ingest_atomic()
+
+    # 7️⃣ Cek expiry RollingWindows
+    check_rolling_windows()
+
+    # 8️⃣ Cek akurasi HyperLogLog unique visitors
+    check_unique_visitors_hll()
+
+    # 9️⃣ Cek lompatan cuaca lintas worker
+    check_station_updates()
+
+    # 🔟 Cek linter PromQL dan dashboard hasil generate
+    check_promql_lint()
+    check_dashboard_generated()
+
+    # 1️⃣1️⃣ Cek urutan status job queue
+    check_job_status_order()
+
     print(f"\n{GREEN}🎉 SEMUA FILE, STRUKTUR, DAN KONFIGURASI TERVALIDASI DENGAN AMAN!{RESET}\n")
 
 if __name__ == "__main__":
@@ -0,0 +1,38 @@
+// Animasi hujan jika rainfall > 5mm (container #rain hanya dirender saat hujan)
+const rainContainer = document.getElementById('rain');
+if (rainContainer) {
+    for (let i = 0; i < 50; i++) {
+        const raindrop = document.createElement('div');
+        raindrop.className = 'raindrop';
+        raindrop.style.left = Math.random() * 100 + '%';
+        raindrop.style.animationDuration = (Math.random() * 0.5 + 0.5) + 's';
+        raindrop.style.animationDelay = Math.random() * 2 + 's';
+        rainContainer.appendChild(raindrop);
+    }
+}
+
+// Animasi counter untuk nilai weather
+document.querySelectorAll('.weather-value').forEach(el => {
+    const text = el.textContent;
+    const finalValue = parseFloat(text.replace(/[^0-9.-]/g, ''));
+    if (!isNaN(finalValue)) {
+        let currentValue = 0;
+        const increment = finalValue / 30;
+        const timer = el.counterTimer = setInterval(() => {
+            currentValue += increment;
+            if (currentValue >= finalValue) {
+                currentValue = finalValue;
+                clearInterval(timer);
+            }
+            if (text.includes('°C')) {
+                el.textContent = currentValue.toFixed(1) + '°C';
+            } else if (text.includes('%')) {
+                el.textContent = Math.round(currentValue) + '%';
+            } else if (text.includes('.')) {
+                el.textContent = currentValue.toFixed(1);
+            } else {
+                el.textContent = Math.round(currentValue);
+            }
+        }, 50);
+    }
+});